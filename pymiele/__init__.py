@@ -1,7 +1,23 @@
 """Library for Miele integration with Home Assistant."""
 
+from .batch import *  # noqa: F403
+from .capabilities import *  # noqa: F403
+from .catalog import *  # noqa: F403
+from .changes import *  # noqa: F403
+from .coalesce import *  # noqa: F403
 from .code_enum import *  # noqa: F403
 from .const import *  # noqa: F403
 from .const import VERSION as __version__  # noqa: F401
+from .coordinator import *  # noqa: F403
+from .decode import *  # noqa: F403
+from .dispatch import *  # noqa: F403
+from .intern import *  # noqa: F403
+from .journal import *  # noqa: F403
 from .model import *  # noqa: F403
+from .optimistic import *  # noqa: F403
+from .profiling import *  # noqa: F403
 from .pymiele import *  # noqa: F403
+from .replay import *  # noqa: F403
+from .session import *  # noqa: F403
+from .stream import *  # noqa: F403
+from .sync import *  # noqa: F403
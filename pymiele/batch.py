@@ -0,0 +1,210 @@
+"""Batched command execution for many devices."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import logging
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import ClientResponseError
+
+if TYPE_CHECKING:
+    from .capabilities import MieleCapabilities
+    from .pymiele import AbstractAuth
+
+BATCH_PARALLEL = 10
+
+COMMAND_ACTION = "action"
+COMMAND_PROGRAM = "program"
+COMMAND_ROOM = "room"
+COMMAND_TARGET_TEMPERATURE = "target_temperature"
+
+# Action keys that set a value, where a later command makes earlier ones moot
+SUPERSEDE_SETTINGS = frozenset({"ambientLight", "colors", "light", "ventilationStep"})
+# processAction start/stop pairs: superfreezing 4/5 and supercooling 6/7
+SUPERSEDE_PROCESS_ACTIONS = {
+    4: "superfreezing",
+    5: "superfreezing",
+    6: "supercooling",
+    7: "supercooling",
+}
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MieleCommand:
+    """A single command to send to a device."""
+
+    __slots__ = ("capabilities", "data", "kind")
+
+    def __init__(
+        self,
+        kind: str,
+        data: dict[str, Any],
+        capabilities: MieleCapabilities | None = None,
+    ) -> None:
+        """Initialize MieleCommand."""
+        if kind not in (
+            COMMAND_ACTION,
+            COMMAND_PROGRAM,
+            COMMAND_ROOM,
+            COMMAND_TARGET_TEMPERATURE,
+        ):
+            raise ValueError(f"Unknown command kind: {kind}")
+        self.kind = kind
+        self.data = data
+        self.capabilities = capabilities
+
+    @classmethod
+    def action(
+        cls, data: dict[str, Any], capabilities: MieleCapabilities | None = None
+    ) -> MieleCommand:
+        """Return an action command."""
+        return cls(COMMAND_ACTION, data, capabilities)
+
+    @classmethod
+    def program(
+        cls, data: dict[str, Any], capabilities: MieleCapabilities | None = None
+    ) -> MieleCommand:
+        """Return a start program command."""
+        return cls(COMMAND_PROGRAM, data, capabilities)
+
+    @classmethod
+    def room(cls, data: dict[str, Any]) -> MieleCommand:
+        """Return a start in room command."""
+        return cls(COMMAND_ROOM, data)
+
+    @classmethod
+    def target_temperature(
+        cls,
+        temperature: float,
+        zone: int = 1,
+        capabilities: MieleCapabilities | None = None,
+    ) -> MieleCommand:
+        """Return a set target temperature command."""
+        return cls(
+            COMMAND_TARGET_TEMPERATURE,
+            {"temperature": temperature, "zone": zone},
+            capabilities,
+        )
+
+    @property
+    def supersede_key(self) -> tuple | None:
+        """Return a key shared by commands where only the latest one matters."""
+        # None means the command is never replaced by a later one
+        if self.kind == COMMAND_TARGET_TEMPERATURE:
+            return (self.kind, self.data["zone"])
+        if self.kind != COMMAND_ACTION:
+            return (self.kind,)
+        parts: list[Any] = []
+        for key, value in sorted(self.data.items()):
+            if key in SUPERSEDE_SETTINGS:
+                parts.append(key)
+            elif key == "targetTemperature" and isinstance(value, list):
+                zones = sorted(
+                    zone.get("zone", 1) for zone in value if isinstance(zone, dict)
+                )
+                parts.append((key, *zones))
+            elif key == "processAction" and value in SUPERSEDE_PROCESS_ACTIONS:
+                # Only the start and stop of the same mode replace each other
+                parts.append((key, SUPERSEDE_PROCESS_ACTIONS[value]))
+            else:
+                return None
+        return (self.kind, *parts)
+
+    async def send(self, auth: AbstractAuth, serial: str) -> int:
+        """Send the command and return the HTTP status."""
+        if self.kind == COMMAND_ACTION:
+            res = await auth.send_action(
+                serial, self.data, capabilities=self.capabilities
+            )
+        elif self.kind == COMMAND_PROGRAM:
+            res = await auth.set_program(
+                serial, self.data, capabilities=self.capabilities
+            )
+        elif self.kind == COMMAND_ROOM:
+            res = await auth.set_room(serial, self.data)
+        else:
+            res = await auth.set_target_temperature(
+                serial,
+                self.data["temperature"],
+                self.data["zone"],
+                capabilities=self.capabilities,
+            )
+        return res.status
+
+    def __repr__(self) -> str:
+        """Return representation."""
+        return f"MieleCommand({self.kind!r}, {self.data!r})"
+
+
+class MieleCommandResult:
+    """Outcome of one command in a batch."""
+
+    __slots__ = ("command", "error", "serial", "status")
+
+    def __init__(
+        self,
+        serial: str,
+        command: MieleCommand,
+        status: int | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        """Initialize MieleCommandResult."""
+        self.serial = serial
+        self.command = command
+        self.status = status
+        self.error = error
+
+    @property
+    def success(self) -> bool:
+        """Return True if the command was accepted by the API."""
+        return self.error is None
+
+    def __repr__(self) -> str:
+        """Return representation."""
+        return (
+            f"MieleCommandResult({self.serial!r}, {self.command!r}, "
+            f"status={self.status}, error={self.error!r})"
+        )
+
+
+async def execute_batch(
+    auth: AbstractAuth,
+    commands: Iterable[tuple[str, MieleCommand]],
+    max_parallel: int = BATCH_PARALLEL,
+) -> list[MieleCommandResult]:
+    """Send commands concurrently and return one result per command, in order."""
+    # Commands for the same serial are sent one at a time in the given order,
+    # different devices run in parallel with at most max_parallel in flight.
+    semaphore = asyncio.Semaphore(max_parallel)
+    results: list[MieleCommandResult] = []
+    per_device: dict[str, list[MieleCommandResult]] = {}
+    for serial, command in commands:
+        result = MieleCommandResult(serial, command)
+        results.append(result)
+        per_device.setdefault(serial, []).append(result)
+
+    async def run_device(queue: list[MieleCommandResult]) -> None:
+        for result in queue:
+            async with semaphore:
+                try:
+                    result.status = await result.command.send(auth, result.serial)
+                except ClientResponseError as ex:
+                    result.status = ex.status
+                    result.error = ex
+                except Exception as ex:  # pylint: disable=broad-except
+                    result.error = ex
+            if result.error is not None:
+                _LOGGER.debug(
+                    "Batch command %s for %s failed: %s",
+                    result.command,
+                    result.serial,
+                    result.error,
+                )
+
+    async with asyncio.TaskGroup() as group:
+        for queue in per_device.values():
+            group.create_task(run_device(queue))
+    return results
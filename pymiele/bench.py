@@ -0,0 +1,302 @@
+"""Load test of the client against a local stub of the Miele API."""
+
+# Run with: python -m pymiele.bench --accounts 50 --devices 10 --duration 30
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import sys
+import time
+from typing import Any
+
+from aiohttp import ClientSession, web
+
+from .intern import MieleInterner
+from .model import MieleDevices
+from .pymiele import AbstractAuth
+from .session import create_event_session, create_session
+
+STUB_HOST = "127.0.0.1"
+
+
+def device_payload(serial: str, status: int = 1) -> dict[str, Any]:
+    """Return a typical washing machine payload."""
+
+    def localized(value_raw: Any, value_localized: str, key: str) -> dict[str, Any]:
+        return {
+            "value_raw": value_raw,
+            "value_localized": value_localized,
+            "key_localized": key,
+        }
+
+    temperature = {"value_raw": -32768, "value_localized": None, "unit": "Celsius"}
+    return {
+        "ident": {
+            "type": localized(1, "Washing machine", "Device type"),
+            "deviceName": "",
+            "deviceIdentLabel": {"fabNumber": serial, "techType": "WCI870"},
+            "xkmIdentLabel": {"techType": "EK057", "releaseVersion": "08.32"},
+        },
+        "state": {
+            "ProgramID": localized(0, "", "Program name"),
+            "status": localized(status, "Running" if status == 5 else "Off", "status"),
+            "programType": localized(0, "", "Program type"),
+            "programPhase": localized(0, "", "Program phase"),
+            "remainingTime": [0, 0],
+            "startTime": [0, 0],
+            "targetTemperature": [dict(temperature) for _ in range(3)],
+            "temperature": [dict(temperature) for _ in range(3)],
+            "signalInfo": False,
+            "signalFailure": False,
+            "signalDoor": False,
+            "remoteEnable": {
+                "fullRemoteControl": True,
+                "smartGrid": False,
+                "mobileStart": False,
+            },
+            "light": 0,
+            "elapsedTime": [0, 0],
+            "spinningSpeed": localized(1400, "1400", "Spin speed"),
+            "ecoFeedback": None,
+        },
+    }
+
+
+def account_devices(token: str, devices: int) -> dict[str, Any]:
+    """Return the devices of a simulated account."""
+    return {
+        f"{token}{index:04d}": device_payload(f"{token}{index:04d}")
+        for index in range(devices)
+    }
+
+
+def run_stub(port: int, devices: int, event_rate: float) -> None:
+    """Serve the stub API until terminated."""
+    accounts: dict[str, dict[str, Any]] = {}
+
+    def get_account(request: web.Request) -> dict[str, Any]:
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if token not in accounts:
+            accounts[token] = account_devices(token, devices)
+        return accounts[token]
+
+    async def get_all(request: web.Request) -> web.Response:
+        return web.json_response(get_account(request))
+
+    async def put_actions(request: web.Request) -> web.Response:
+        await request.read()
+        return web.Response(status=204)
+
+    async def events(request: web.Request) -> web.StreamResponse:
+        data = get_account(request)
+        response = web.StreamResponse(
+            headers={"Content-Type": "text/event-stream; charset=utf-8"}
+        )
+        await response.prepare(request)
+        serials = list(data)
+        last_ping = time.monotonic()
+        try:
+            while True:
+                await asyncio.sleep(
+                    random.expovariate(event_rate) if event_rate > 0 else 20
+                )
+                if event_rate > 0:
+                    serial = random.choice(serials)
+                    payload = device_payload(serial, random.choice((1, 5)))
+                    payload["benchSent"] = time.time()
+                    body = json.dumps({serial: payload})
+                    await response.write(f"event: devices\ndata: {body}\n\n".encode())
+                if time.monotonic() - last_ping > 20:
+                    last_ping = time.monotonic()
+                    await response.write(b"event: ping\ndata: ping\n\n")
+        except ConnectionResetError:
+            # Client went away at the end of the run
+            pass
+        return response
+
+    app = web.Application()
+    app.router.add_get("/devices", get_all)
+    app.router.add_put("/devices/{serial}/actions", put_actions)
+    app.router.add_get("/devices/all/events", events)
+    web.run_app(app, host=STUB_HOST, port=port, print=None, handle_signals=False)
+
+
+class BenchAuth(AbstractAuth):
+    """Auth for one simulated account against the stub."""
+
+    def __init__(self, websession: ClientSession, host: str, token: str) -> None:
+        """Initialize BenchAuth."""
+        super().__init__(websession, host, event_url=f"{host}/devices/all/events")
+        self.token = token
+
+    async def async_get_access_token(self) -> str:
+        """Return the account token."""
+        return self.token
+
+
+class BenchStats:
+    """Samples collected during a run."""
+
+    def __init__(self) -> None:
+        """Initialize BenchStats."""
+        self.rest: list[float] = []
+        self.rest_errors = 0
+        self.lag: list[float] = []
+
+    @staticmethod
+    def percentile(samples: list[float], percentile: float) -> float:
+        """Return the percentile of samples in milliseconds."""
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        return ordered[round(percentile / 100 * (len(ordered) - 1))] * 1000
+
+
+def rss_bytes() -> int | None:
+    """Return the peak resident set size of this process, if known."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+async def run_account(
+    auth: BenchAuth,
+    stats: BenchStats,
+    rest_rate: float,
+    duration: float,
+    interner: MieleInterner | None,
+) -> None:
+    """Drive the REST and event workload of one account."""
+    state = MieleDevices(await auth.get_devices(), interner)
+
+    async def on_devices(data: dict[str, Any]) -> None:
+        now = time.time()
+        for serial, payload in data.items():
+            if (sent := payload.pop("benchSent", None)) is not None:
+                stats.lag.append(now - sent)
+            state.raw_data[serial] = payload
+
+    listener = asyncio.create_task(auth.listen_events(on_devices))
+    serials = state.devices
+    end = time.monotonic() + duration
+    try:
+        while rest_rate > 0:
+            remaining = end - time.monotonic()
+            await asyncio.sleep(min(random.expovariate(rest_rate), max(remaining, 0)))
+            if time.monotonic() >= end:
+                break
+            start = time.perf_counter()
+            try:
+                if random.random() < 0.5:
+                    await auth.get_devices()
+                else:
+                    await auth.send_action(random.choice(serials), {"light": 1})
+            except Exception:  # pylint: disable=broad-except
+                stats.rest_errors += 1
+            else:
+                stats.rest.append(time.perf_counter() - start)
+        await asyncio.sleep(max(0.0, end - time.monotonic()))
+    finally:
+        listener.cancel()
+
+
+async def run_clients(args: argparse.Namespace) -> BenchStats:
+    """Run all simulated accounts and return the samples."""
+    host = f"http://{STUB_HOST}:{args.port}"
+    stats = BenchStats()
+    interner = MieleInterner() if args.intern else None
+    websession = create_session()
+    event_websession = create_event_session()
+    try:
+        auths = [
+            BenchAuth(websession, host, f"acct{index:05d}")
+            for index in range(args.accounts)
+        ]
+        for auth in auths:
+            auth.event_websession = event_websession
+            auth.interner = interner
+        await asyncio.gather(
+            *(
+                run_account(auth, stats, args.rest_rate, args.duration, interner)
+                for auth in auths
+            )
+        )
+    finally:
+        await websession.close()
+        await event_websession.close()
+    return stats
+
+
+async def wait_for_stub(port: int) -> None:
+    """Wait until the stub accepts connections."""
+    for _ in range(100):
+        try:
+            _, writer = await asyncio.open_connection(STUB_HOST, port)
+        except OSError:
+            await asyncio.sleep(0.1)
+        else:
+            writer.close()
+            return
+    raise RuntimeError("Stub did not start")
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the load test and write a report to stdout."""
+    parser = argparse.ArgumentParser(prog="python -m pymiele.bench")
+    parser.add_argument("--accounts", type=int, default=10)
+    parser.add_argument("--devices", type=int, default=5, help="per account")
+    parser.add_argument("--duration", type=float, default=10, help="seconds")
+    parser.add_argument(
+        "--rest-rate", type=float, default=1, help="requests/s per account"
+    )
+    parser.add_argument(
+        "--event-rate", type=float, default=2, help="events/s per account"
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--intern", action="store_true", help="use MieleInterner")
+    args = parser.parse_args(argv)
+
+    stub = multiprocessing.Process(
+        target=run_stub, args=(args.port, args.devices, args.event_rate), daemon=True
+    )
+    stub.start()
+    try:
+        asyncio.run(wait_for_stub(args.port))
+        rss_before = rss_bytes()
+        started = time.perf_counter()
+        stats = asyncio.run(run_clients(args))
+        elapsed = time.perf_counter() - started
+        rss_after = rss_bytes()
+    finally:
+        stub.terminate()
+        stub.join()
+
+    total_devices = args.accounts * args.devices
+    lines = [
+        f"accounts: {args.accounts}, devices: {total_devices}, duration: {elapsed:.1f}s",
+        f"rest: {len(stats.rest)} ok, {stats.rest_errors} errors, "
+        f"{len(stats.rest) / elapsed:.1f} req/s, "
+        f"p50 {stats.percentile(stats.rest, 50):.1f} ms, "
+        f"p99 {stats.percentile(stats.rest, 99):.1f} ms",
+        f"events: {len(stats.lag)}, {len(stats.lag) / elapsed:.1f} events/s, "
+        f"lag p50 {stats.percentile(stats.lag, 50):.1f} ms, "
+        f"p99 {stats.percentile(stats.lag, 99):.1f} ms",
+    ]
+    if rss_before is not None and rss_after is not None and total_devices:
+        lines.append(
+            f"memory: peak rss {rss_after / 2**20:.1f} MiB, "
+            f"{(rss_after - rss_before) / total_devices / 1024:.1f} KiB per device"
+        )
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
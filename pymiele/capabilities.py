@@ -0,0 +1,193 @@
+"""Capability index for validating commands locally."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .model import MieleAction, MieleProgramsAvailable
+from .pymiele import MieleException
+
+# Action keys whose value must be one of the codes listed by the API
+SET_ACTIONS = (
+    "processAction",
+    "light",
+    "ambientLight",
+    "ventilationStep",
+    "modes",
+    "programId",
+)
+
+# Action keys that are only allowed when the API flags them as enabled
+FLAG_ACTIONS = ("powerOn", "powerOff", "deviceName")
+
+
+class MieleValidationError(MieleException):
+    """Command rejected by local validation."""
+
+
+class MieleTemperatureRange:
+    """Allowed target temperature range for a zone."""
+
+    __slots__ = ("max", "min", "zone")
+
+    def __init__(self, zone: int, min_value: int | None, max_value: int | None) -> None:
+        """Initialize MieleTemperatureRange."""
+        self.zone = zone
+        self.min = min_value
+        self.max = max_value
+
+    def __contains__(self, value: object) -> bool:
+        """Return True if value is within the range."""
+        if not isinstance(value, int | float):
+            return False
+        if self.min is not None and value < self.min:
+            return False
+        return not (self.max is not None and value > self.max)
+
+    def __repr__(self) -> str:
+        """Return representation."""
+        return (
+            f"MieleTemperatureRange(zone={self.zone}, min={self.min}, max={self.max})"
+        )
+
+
+class MieleProgramConstraints:
+    """Parameter constraints for one available program."""
+
+    __slots__ = ("duration", "name", "program_id", "required", "temperature")
+
+    def __init__(self, raw_data: dict) -> None:
+        """Initialize MieleProgramConstraints."""
+        parameters = raw_data.get("parameters") or {}
+        self.program_id: int | None = raw_data.get("programId")
+        self.name: str | None = raw_data.get("program")
+        self.temperature: dict[str, Any] | None = parameters.get("temperature")
+        self.duration: dict[str, Any] | None = parameters.get("duration")
+        self.required = frozenset(
+            key
+            for key, value in parameters.items()
+            if isinstance(value, dict) and value.get("mandatory")
+        )
+
+    def validate(self, data: dict[str, Any]) -> None:
+        """Raise MieleValidationError if program parameters are not allowed."""
+        if missing := self.required.difference(data):
+            raise MieleValidationError(
+                f"Program {self.program_id} requires parameters: {sorted(missing)}"
+            )
+        if "temperature" in data and self.temperature is not None:
+            value = data["temperature"]
+            if not isinstance(value, int | float) or isinstance(value, bool):
+                raise MieleValidationError(f"Temperature {value!r} is not a number")
+            low = self.temperature.get("min")
+            high = self.temperature.get("max")
+            step = self.temperature.get("step")
+            if (low is not None and value < low) or (high is not None and value > high):
+                raise MieleValidationError(
+                    f"Temperature {value} outside {low}-{high} for program {self.program_id}"
+                )
+            if step and low is not None and (value - low) % step:
+                raise MieleValidationError(
+                    f"Temperature {value} not a multiple of step {step} from {low}"
+                )
+        if "duration" in data and self.duration is not None:
+            value = data["duration"]
+            if not isinstance(value, list | tuple) or not all(
+                isinstance(part, int) and not isinstance(part, bool) for part in value
+            ):
+                raise MieleValidationError(
+                    f"Duration {value!r} is not a list of hours and minutes"
+                )
+            value = list(value)
+            low = self.duration.get("min")
+            high = self.duration.get("max")
+            if (low is not None and value < list(low)) or (
+                high is not None and value > list(high)
+            ):
+                raise MieleValidationError(
+                    f"Duration {value} outside {low}-{high} for program {self.program_id}"
+                )
+
+
+class MieleCapabilities:
+    """Precomputed index of actions and programs accepted by a device."""
+
+    def __init__(
+        self,
+        actions: dict | MieleAction | None = None,
+        programs: list | MieleProgramsAvailable | None = None,
+    ) -> None:
+        """Initialize MieleCapabilities."""
+        self.allowed: dict[str, frozenset[int]] | None = None
+        self.enabled: frozenset[str] = frozenset()
+        self.temperature_ranges: dict[int, MieleTemperatureRange] = {}
+        self.programs: dict[int, MieleProgramConstraints] | None = None
+        self.update_actions(actions)
+        self.update_programs(programs)
+
+    def update_actions(self, actions: dict | MieleAction | None) -> None:
+        """Rebuild the action part of the index."""
+        if actions is None:
+            return
+        raw = actions.raw if isinstance(actions, MieleAction) else actions
+        self.allowed = {key: frozenset(raw.get(key) or ()) for key in SET_ACTIONS}
+        self.enabled = frozenset(key for key in FLAG_ACTIONS if raw.get(key))
+        self.temperature_ranges = {
+            temp["zone"]: MieleTemperatureRange(
+                temp["zone"], temp.get("min"), temp.get("max")
+            )
+            for temp in raw.get("targetTemperature") or ()
+            if "zone" in temp
+        }
+
+    def update_programs(self, programs: list | MieleProgramsAvailable | None) -> None:
+        """Rebuild the program part of the index."""
+        if programs is None:
+            return
+        raw = (
+            programs.raw_data
+            if isinstance(programs, MieleProgramsAvailable)
+            else programs
+        )
+        self.programs = {}
+        for program in raw:
+            constraints = MieleProgramConstraints(program)
+            if constraints.program_id is not None:
+                self.programs[constraints.program_id] = constraints
+
+    def validate_action(self, data: dict[str, Any]) -> None:
+        """Raise MieleValidationError if the action is not allowed."""
+        if self.allowed is None:
+            return
+        for key, value in data.items():
+            if key in self.allowed:
+                if value not in self.allowed[key]:
+                    raise MieleValidationError(
+                        f"{key} {value} not allowed, expected one of {sorted(self.allowed[key])}"
+                    )
+            elif key in FLAG_ACTIONS:
+                if key not in self.enabled:
+                    raise MieleValidationError(f"{key} is not enabled")
+            elif key == "targetTemperature":
+                for target in value:
+                    self.validate_target_temperature(target["value"], target["zone"])
+
+    def validate_target_temperature(self, temperature: float, zone: int = 1) -> None:
+        """Raise MieleValidationError if the target temperature is not allowed."""
+        if self.allowed is None:
+            return
+        if (temp_range := self.temperature_ranges.get(zone)) is None:
+            raise MieleValidationError(f"Zone {zone} has no settable temperature")
+        if temperature not in temp_range:
+            raise MieleValidationError(
+                f"Temperature {temperature} outside {temp_range.min}-{temp_range.max} for zone {zone}"
+            )
+
+    def validate_program(self, data: dict[str, Any]) -> None:
+        """Raise MieleValidationError if the program command is not allowed."""
+        if self.programs is None:
+            return
+        program_id = data.get("programId")
+        if (constraints := self.programs.get(program_id)) is None:  # type: ignore[arg-type]
+            raise MieleValidationError(f"Program {program_id} is not available")
+        constraints.validate(data)
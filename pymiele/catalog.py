@@ -0,0 +1,127 @@
+"""Program catalog shared by devices of the same model and firmware."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any
+
+from .model import MieleDevice, MieleProgramAvailable, MieleProgramsAvailable
+
+if TYPE_CHECKING:
+    from .pymiele import AbstractAuth
+
+_LOGGER = logging.getLogger(__name__)
+
+CatalogKey = tuple[str, str]
+
+
+class MieleProgramCatalogEntry:
+    """Available programs of one model, indexed by program id."""
+
+    __slots__ = ("by_id", "key", "programs")
+
+    def __init__(self, key: CatalogKey, raw_data: list[dict[str, Any]]) -> None:
+        """Initialize MieleProgramCatalogEntry."""
+        self.key = key
+        self.programs = MieleProgramsAvailable(raw_data)
+        self.by_id: dict[int, MieleProgramAvailable] = {}
+        for program in self.programs.programs:
+            if program.program_id is not None:
+                self.by_id[program.program_id] = program
+
+    def get(self, program_id: int) -> MieleProgramAvailable | None:
+        """Return the program with this id, if available."""
+        return self.by_id.get(program_id)
+
+
+class MieleProgramCatalog:
+    """Fetch programs once per tech type and firmware and share them."""
+
+    def __init__(self, auth: AbstractAuth) -> None:
+        """Initialize MieleProgramCatalog."""
+        self.auth = auth
+        self.entries: dict[CatalogKey, MieleProgramCatalogEntry] = {}
+        self._keys: dict[str, CatalogKey] = {}
+        self._fetching: dict[CatalogKey, asyncio.Future[MieleProgramCatalogEntry]] = {}
+
+    @staticmethod
+    def key_for(serial: str, device: MieleDevice) -> CatalogKey:
+        """Return the catalog key of a device."""
+        # Without a tech type the model is unknown, do not share with others
+        tech_type = device.tech_type or f"serial:{serial}"
+        return (tech_type, device.xkm_release_version)
+
+    async def get_programs(
+        self, serial: str, device: MieleDevice
+    ) -> MieleProgramCatalogEntry:
+        """Return the programs for a device, fetching only for unseen models."""
+        key = self.update_device(serial, device)
+        while (future := self._fetching.get(key)) is not None:
+            try:
+                shared = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if not future.cancelled() or (task is not None and task.cancelling()):
+                    raise
+                # The fetching task was cancelled, not this one, so fetch again
+                continue
+            except Exception:  # pylint: disable=broad-except
+                # That device may be offline, ask for this one instead
+                break
+            if shared.programs.programs:
+                return shared
+            # Another device of the model listed no programs, ask for this one
+            break
+        if (cached := self.entries.get(key)) is not None:
+            return cached
+        return await self._fetch(key, serial)
+
+    def update_device(self, serial: str, device: MieleDevice) -> CatalogKey:
+        """Record the model of a device, dropping entries left unused on firmware change."""
+        key = self.key_for(serial, device)
+        old = self._keys.get(serial)
+        self._keys[serial] = key
+        if old is not None and old != key and old not in self._keys.values():
+            _LOGGER.debug("Dropping program catalog for %s", old)
+            self.entries.pop(old, None)
+        return key
+
+    async def _fetch(self, key: CatalogKey, serial: str) -> MieleProgramCatalogEntry:
+        # Waiters falling back to their own device do not replace a shared fetch
+        future: asyncio.Future[MieleProgramCatalogEntry] | None = None
+        if key not in self._fetching:
+            future = asyncio.get_running_loop().create_future()
+            self._fetching[key] = future
+        try:
+            entry = MieleProgramCatalogEntry(
+                key,
+                await self.auth.get_programs(serial),  # type: ignore[arg-type]
+            )
+        except asyncio.CancelledError:
+            if future is not None:
+                future.cancel()
+            raise
+        except Exception as ex:
+            if future is not None:
+                future.set_exception(ex)
+                # Retrieve so an unawaited failure is not reported as unhandled
+                future.exception()
+            raise
+        finally:
+            if future is not None:
+                del self._fetching[key]
+        _LOGGER.debug("Fetched program catalog for %s via %s", key, serial)
+        # Devices list no programs in some states, do not share an empty list
+        if entry.programs.programs:
+            self.entries[key] = entry
+        if future is not None:
+            future.set_result(entry)
+        return entry
+
+    def invalidate(self, key: CatalogKey | None = None) -> None:
+        """Forget one catalog entry or all of them."""
+        if key is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(key, None)
@@ -0,0 +1,191 @@
+"""Field-level change detection for device payloads."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import copy
+import logging
+from typing import Any
+
+from .model import MieleDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+FieldPath = tuple[str | int, ...]
+
+# Raw data path read by each MieleDevice property
+DEVICE_PROPERTY_PATHS: dict[str, FieldPath] = {
+    "fab_number": ("ident", "deviceIdentLabel", "fabNumber"),
+    "device_type": ("ident", "type", "value_raw"),
+    "device_type_localized": ("ident", "type", "value_localized"),
+    "device_name": ("ident", "deviceName"),
+    "tech_type": ("ident", "deviceIdentLabel", "techType"),
+    "xkm_tech_type": ("ident", "xkmIdentLabel", "techType"),
+    "xkm_release_version": ("ident", "xkmIdentLabel", "releaseVersion"),
+    "state_program_id": ("state", "ProgramID", "value_raw"),
+    "state_program_id_localized": ("state", "ProgramID", "value_localized"),
+    "state_status": ("state", "status", "value_raw"),
+    "state_status_localized": ("state", "status", "value_localized"),
+    "state_program_type": ("state", "programType", "value_raw"),
+    "state_program_type_localized": ("state", "programType", "value_localized"),
+    "state_program_phase": ("state", "programPhase", "value_raw"),
+    "state_program_phase_localized": ("state", "programPhase", "value_localized"),
+    "state_remaining_time": ("state", "remainingTime"),
+    "state_start_time": ("state", "startTime"),
+    "state_target_temperature": ("state", "targetTemperature"),
+    "state_core_target_temperature": ("state", "coreTargetTemperature"),
+    "state_temperatures": ("state", "temperature"),
+    "state_core_temperature": ("state", "coreTemperature"),
+    "state_signal_info": ("state", "signalInfo"),
+    "state_signal_failure": ("state", "signalFailure"),
+    "state_signal_door": ("state", "signalDoor"),
+    "state_full_remote_control": ("state", "remoteEnable", "fullRemoteControl"),
+    "state_smart_grid": ("state", "remoteEnable", "smartGrid"),
+    "state_mobile_start": ("state", "remoteEnable", "mobileStart"),
+    "state_ambient_light": ("state", "ambientLight"),
+    "state_light": ("state", "light"),
+    "state_elapsed_time": ("state", "elapsedTime"),
+    "state_spinning_speed": ("state", "spinningSpeed", "value_raw"),
+    "state_drying_step": ("state", "dryingStep", "value_raw"),
+    "state_ventilation_step": ("state", "ventilationStep", "value_raw"),
+    "state_plate_step": ("state", "plateStep"),
+    "state_eco_feedback": ("state", "ecoFeedback"),
+    "current_water_consumption": (
+        "state",
+        "ecoFeedback",
+        "currentWaterConsumption",
+        "value",
+    ),
+    "current_energy_consumption": (
+        "state",
+        "ecoFeedback",
+        "currentEnergyConsumption",
+        "value",
+    ),
+    "water_forecast": ("state", "ecoFeedback", "waterForecast"),
+    "energy_forecast": ("state", "ecoFeedback", "energyForecast"),
+    "state_battery_level": ("state", "batteryLevel"),
+}
+
+
+def _build_index() -> tuple[dict[FieldPath, set[str]], dict[FieldPath, set[str]]]:
+    """Return properties reading exactly a path and properties reading below it."""
+    exact: dict[FieldPath, set[str]] = {}
+    below: dict[FieldPath, set[str]] = {}
+    for name, path in DEVICE_PROPERTY_PATHS.items():
+        exact.setdefault(path, set()).add(name)
+        for index in range(len(path)):
+            below.setdefault(path[:index], set()).add(name)
+    return exact, below
+
+
+_EXACT, _BELOW = _build_index()
+
+
+def diff_payloads(old: Any, new: Any, path: FieldPath = ()) -> list[FieldPath]:
+    """Return the paths of all leaves that differ between two payloads."""
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        changed: list[FieldPath] = []
+        for key in old.keys() | new.keys():
+            if key not in old or key not in new:
+                changed.append((*path, key))
+            else:
+                changed.extend(diff_payloads(old[key], new[key], (*path, key)))
+        return changed
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        changed = []
+        for index, (old_item, new_item) in enumerate(zip(old, new, strict=True)):
+            changed.extend(diff_payloads(old_item, new_item, (*path, index)))
+        return changed
+    return [path]
+
+
+def changed_properties(paths: list[FieldPath]) -> set[str]:
+    """Return the MieleDevice property names affected by changed paths."""
+    names: set[str] = set()
+    for path in paths:
+        names.update(_BELOW.get(path, ()))
+        for index in range(len(path), 0, -1):
+            names.update(_EXACT.get(path[:index], ()))
+    return names
+
+
+class MieleDeviceChanges:
+    """Change set for one device."""
+
+    __slots__ = ("paths", "properties", "serial")
+
+    def __init__(self, serial: str, paths: list[FieldPath]) -> None:
+        """Initialize MieleDeviceChanges."""
+        self.serial = serial
+        self.paths = paths
+        self.properties = changed_properties(paths)
+
+    def __bool__(self) -> bool:
+        """Return True if anything changed."""
+        return bool(self.paths)
+
+    def __repr__(self) -> str:
+        """Return representation."""
+        return f"MieleDeviceChanges({self.serial!r}, {sorted(self.properties)})"
+
+
+DeviceCallback = Callable[[str, MieleDevice], None]
+
+
+class MieleChangeTracker:
+    """Keep the last payload per device and notify subscribers of changed fields."""
+
+    def __init__(self) -> None:
+        """Initialize MieleChangeTracker."""
+        self.payloads: dict[str, dict] = {}
+        self._subscribers: dict[str, list[tuple[str | None, DeviceCallback]]] = {}
+
+    def subscribe(
+        self, prop: str, callback: DeviceCallback, serial: str | None = None
+    ) -> Callable[[], None]:
+        """Call callback when prop changes, for one serial or all. Return unsubscribe."""
+        if prop not in DEVICE_PROPERTY_PATHS:
+            raise ValueError(f"Unknown MieleDevice property: {prop}")
+        entry = (serial, callback)
+        self._subscribers.setdefault(prop, []).append(entry)
+
+        def unsubscribe() -> None:
+            self._subscribers[prop].remove(entry)
+
+        return unsubscribe
+
+    def update(self, data: dict[str, dict]) -> dict[str, MieleDeviceChanges]:
+        """Store new payloads, notify subscribers and return the changes."""
+        result: dict[str, MieleDeviceChanges] = {}
+        for serial, payload in data.items():
+            old = self.payloads.get(serial)
+            paths: list[FieldPath] = (
+                diff_payloads(old, payload) if old is not None else [()]
+            )
+            # Keep a private copy, subscribers may mutate the device they receive
+            self.payloads[serial] = copy.deepcopy(payload)
+            if not paths:
+                continue
+            changes = MieleDeviceChanges(serial, paths)
+            result[serial] = changes
+            self._notify(changes, MieleDevice(payload))
+        return result
+
+    async def async_handle_event(self, data: dict[str, Any]) -> None:
+        """Update from a devices event, usable as listen_events data_callback."""
+        self.update(data)
+
+    def _notify(self, changes: MieleDeviceChanges, device: MieleDevice) -> None:
+        called: set[int] = set()
+        for prop in changes.properties:
+            for serial, callback in self._subscribers.get(prop, ()):
+                if serial not in (None, changes.serial) or id(callback) in called:
+                    continue
+                called.add(id(callback))
+                try:
+                    callback(changes.serial, device)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Error in change callback for %s", prop)
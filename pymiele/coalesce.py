@@ -0,0 +1,102 @@
+"""Coalescing of devices and actions events per device."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+from typing import Any
+
+from .const import COALESCE_WINDOW
+from .model import MieleAction, MieleDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MieleDeviceUpdate:
+    """Combined device state and actions update for one device."""
+
+    __slots__ = ("actions", "device", "serial")
+
+    def __init__(self, serial: str) -> None:
+        """Initialize MieleDeviceUpdate."""
+        self.serial = serial
+        self.device: MieleDevice | None = None
+        self.actions: MieleAction | None = None
+
+    @property
+    def complete(self) -> bool:
+        """Return True if both device state and actions are present."""
+        return self.device is not None and self.actions is not None
+
+    def __repr__(self) -> str:
+        """Return representation."""
+        return (
+            f"MieleDeviceUpdate({self.serial!r}, device={self.device is not None}, "
+            f"actions={self.actions is not None})"
+        )
+
+
+UpdateCallback = Callable[[dict[str, MieleDeviceUpdate]], Any]
+
+
+class MieleEventCoalescer:
+    """Merge devices and actions events for a serial arriving within a window."""
+
+    def __init__(
+        self, callback: UpdateCallback, window: float = COALESCE_WINDOW
+    ) -> None:
+        """Initialize MieleEventCoalescer."""
+        self.callback = callback
+        self.window = window
+        self._pending: dict[str, MieleDeviceUpdate] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def async_handle_devices(self, data: dict[str, Any]) -> None:
+        """Add a devices event, usable as listen_events data_callback."""
+        for serial, payload in data.items():
+            self._update(serial).device = MieleDevice(payload)
+        self._schedule()
+
+    async def async_handle_actions(self, data: dict[str, Any]) -> None:
+        """Add an actions event, usable as listen_events actions_callback."""
+        for serial, payload in data.items():
+            self._update(serial).actions = MieleAction(payload)
+        self._schedule()
+
+    def flush(self) -> None:
+        """Deliver all pending updates now."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._deliver(list(self._pending))
+
+    def _update(self, serial: str) -> MieleDeviceUpdate:
+        if (update := self._pending.get(serial)) is None:
+            update = self._pending[serial] = MieleDeviceUpdate(serial)
+        return update
+
+    def _schedule(self) -> None:
+        # Devices with both halves have nothing more to wait for
+        self._deliver([serial for serial, up in self._pending.items() if up.complete])
+        if not self._pending:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self.flush)
+
+    def _deliver(self, serials: list[str]) -> None:
+        if not serials:
+            return
+        updates = {serial: self._pending.pop(serial) for serial in serials}
+        task = asyncio.create_task(self._call(updates))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _call(self, updates: dict[str, MieleDeviceUpdate]) -> None:
+        try:
+            await self.callback(updates)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error in coalesced update callback")
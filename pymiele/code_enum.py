@@ -1,6 +1,7 @@
 """Enum class for Miele intergration."""
 
 from enum import IntEnum
+from functools import cache
 import logging
 from typing import Any
 
@@ -28,22 +29,14 @@ class MieleEnum(IntEnum):
 
     @classmethod
     def _missing_(cls, value: object) -> Any | None:
-        if hasattr(cls, "unknown_code") or hasattr(cls, "unknown"):
-            warning = (
-                f"Missing {cls.__name__} code: {value} - defaulting to 'unknown_code'"
-            )
-            if warning not in completed_warnings:
-                completed_warnings.add(warning)
-                _LOGGER.warning(warning)
-            return cls.unknown_code  # pylint: disable=no-member
-        if hasattr(cls, "missing2none"):
-            warning = f"Missing {cls.__name__} code: {value} - defaulting to Unknown"
-            if warning not in completed_warnings:
-                completed_warnings.add(warning)
-                _LOGGER.warning(warning)
-            return cls.missing2none  # pylint: disable=no-member
-
-        return None
+        if (member := cls.fallback()) is None:
+            return None
+        default = "Unknown" if member._name_ == "missing2none" else f"'{member._name_}'"
+        warning = f"Missing {cls.__name__} code: {value} - defaulting to {default}"
+        if warning not in completed_warnings:
+            completed_warnings.add(warning)
+            _LOGGER.warning(warning)
+        return member
 
     def __new__(cls, value: int, *values: list[int]) -> Any:
         """Allow duplicate values."""
@@ -53,6 +46,20 @@ class MieleEnum(IntEnum):
             self._add_value_alias_(v)
         return self
 
+    @classmethod
+    @cache
+    def lookup_table(cls) -> dict[int, Any]:
+        """Return a cached dict of all values, aliases included, to members."""
+        return dict(cls._value2member_map_)
+
+    @classmethod
+    def fallback(cls) -> Any | None:
+        """Return the member used for missing codes, without logging."""
+        for name in ("unknown_code", "unknown", "missing2none"):
+            if name in cls.__members__:
+                return cls.__members__[name]
+        return None
+
     @classmethod
     def as_dict(cls) -> dict[str, int]:
         """Return a dict of enum names and values."""
@@ -7,3 +7,31 @@ OAUTH2_AUTHORIZE = "https://api.mcs3.miele.com/thirdparty/login"
 OAUTH2_TOKEN = "https://api.mcs3.miele.com/thirdparty/token"
 
 AIO_TIMEOUT = 15
+EVENT_CONNECT_TIMEOUT = 5
+EVENT_PING_TIMEOUT = 120
+
+SESSION_LIMIT = 100
+SESSION_LIMIT_PER_HOST = 20
+SESSION_DNS_TTL = 300
+SESSION_KEEPALIVE = 30
+
+POLL_GRACE = 10
+POLL_FAST_INTERVAL = 30
+POLL_SLOW_INTERVAL = 300
+
+# Gaps longer than this are resynced with a full refresh
+RESYNC_FULL_AFTER = 300
+
+OPTIMISTIC_TIMEOUT = 30
+
+DISPATCH_QUEUE_SIZE = 1000
+DISPATCH_WORKERS = 1
+
+COALESCE_WINDOW = 0.5
+
+JOURNAL_MAX_AGE = 3600
+JOURNAL_RETRY_INITIAL = 5
+JOURNAL_RETRY_MAX = 300
+
+# Status codes where a program is set up or running and state changes quickly
+ACTIVE_STATUSES = frozenset({3, 4, 5, 6, 7, 9, 11})
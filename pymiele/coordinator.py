@@ -0,0 +1,172 @@
+"""Event stream with polling fallback."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import copy
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import ClientError
+
+from .const import (
+    ACTIVE_STATUSES,
+    POLL_FAST_INTERVAL,
+    POLL_GRACE,
+    POLL_SLOW_INTERVAL,
+    RESYNC_FULL_AFTER,
+)
+from .model import MieleDevice
+
+if TYPE_CHECKING:
+    from .pymiele import AbstractAuth
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MieleEventCoordinator:
+    """Deliver device updates from the event stream, polling while it is down."""
+
+    def __init__(
+        self,
+        auth: AbstractAuth,
+        data_callback: Callable[[dict[str, Any]], Any] | None = None,
+        actions_callback: Callable[[dict[str, Any]], Any] | None = None,
+        fast_interval: float = POLL_FAST_INTERVAL,
+        slow_interval: float = POLL_SLOW_INTERVAL,
+        grace: float = POLL_GRACE,
+        resync_full_after: float = RESYNC_FULL_AFTER,
+    ) -> None:
+        """Initialize MieleEventCoordinator."""
+        self.auth = auth
+        self.data_callback = data_callback
+        self.actions_callback = actions_callback
+        self.fast_interval = fast_interval
+        self.slow_interval = slow_interval
+        self.grace = grace
+        self.resync_full_after = resync_full_after
+        self.connected = False
+        self.payloads: dict[str, dict] = {}
+        self.last_seen: dict[str, float] = {}
+        self._disconnected_at: float | None = None
+        self._poller: asyncio.Task[None] | None = None
+        self._resync: asyncio.Task[None] | None = None
+
+    @property
+    def polling(self) -> bool:
+        """Return True while the polling fallback is active."""
+        return self._poller is not None and not self._poller.done()
+
+    def active_devices(self) -> list[str]:
+        """Return serials of devices with a program set up or running."""
+        return [
+            serial
+            for serial, payload in self.payloads.items()
+            if MieleDevice(payload).state_status in ACTIVE_STATUSES
+        ]
+
+    def next_interval(self) -> float:
+        """Return the poll interval, short while any device is active."""
+        if self.active_devices():
+            return self.fast_interval
+        return self.slow_interval
+
+    async def run(self) -> None:
+        """Listen to events until cancelled, falling back to polling."""
+        self._start_polling()
+        try:
+            await self.auth.listen_events(
+                self._handle_devices,
+                self.actions_callback,
+                connection_callback=self._handle_connection,
+            )
+        finally:
+            self._stop_polling()
+            if self._resync is not None:
+                self._resync.cancel()
+
+    def _handle_connection(self, connected: bool) -> None:
+        self.connected = connected
+        if connected:
+            _LOGGER.debug("Event stream connected, polling stopped")
+            self._stop_polling()
+            if self._disconnected_at is not None:
+                gap = time.monotonic() - self._disconnected_at
+                self._disconnected_at = None
+                if self._resync is not None:
+                    # Superseded by this reconnect, which covers the same gap
+                    self._resync.cancel()
+                self._resync = asyncio.create_task(self._resync_after_gap(gap))
+        else:
+            self._disconnected_at = time.monotonic()
+            self._start_polling()
+
+    async def _resync_after_gap(self, gap: float) -> None:
+        # Events sent while disconnected are lost. Idle devices rarely change,
+        # so only active devices are fetched unless the gap was long.
+        try:
+            if gap > self.resync_full_after or not self.payloads:
+                _LOGGER.debug("Event gap of %.0fs, refreshing all devices", gap)
+                await self._deliver(await self.auth.get_devices())
+                return
+            connected_at = time.monotonic()
+            serials = self.active_devices()
+            _LOGGER.debug("Event gap of %.0fs, resyncing %s", gap, serials)
+            for serial in serials:
+                if self.last_seen.get(serial, 0) >= connected_at:
+                    # Already delivered by the new stream
+                    continue
+                await self._deliver({serial: await self.auth.get_device(serial)})
+                if self.actions_callback is not None:
+                    actions = await self.auth.get_actions(serial)
+                    await self.actions_callback({serial: actions})
+        except (TimeoutError, ClientError) as ex:
+            _LOGGER.debug("Resync after event gap failed: %s", ex)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error resyncing after event gap")
+
+    def _start_polling(self) -> None:
+        if not self.polling:
+            self._poller = asyncio.create_task(self._poll())
+
+    def _stop_polling(self) -> None:
+        if self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+
+    async def _poll(self) -> None:
+        await asyncio.sleep(self.grace)
+        _LOGGER.debug("Event stream unavailable, polling devices")
+        while not self.connected:
+            try:
+                data = await self.auth.get_devices()
+                await self._deliver(data)
+            except (TimeoutError, ClientError) as ex:
+                _LOGGER.debug("Polling devices failed: %s", ex)
+            except Exception:  # pylint: disable=broad-except
+                # Keep polling, a dead poller would leave consumers without data
+                _LOGGER.exception("Error polling devices")
+            await asyncio.sleep(self.next_interval())
+
+    async def _handle_devices(self, data: dict[str, Any]) -> None:
+        await self._deliver(data)
+
+    async def _deliver(self, data: dict[str, Any]) -> None:
+        # Polls and events overlap around reconnects, only pass on real changes
+        now = time.monotonic()
+        for serial in data:
+            self.last_seen[serial] = now
+        changed = {
+            serial: payload
+            for serial, payload in data.items()
+            if self.payloads.get(serial) != payload
+        }
+        if not changed:
+            return
+        # Keep a private copy, callbacks may mutate the payloads they receive
+        for serial, payload in changed.items():
+            self.payloads[serial] = copy.deepcopy(payload)
+        if self.data_callback is not None:
+            await self.data_callback(changed)
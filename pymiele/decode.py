@@ -0,0 +1,110 @@
+"""Decoding of all enum-typed device fields in one pass."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from .changes import DEVICE_PROPERTY_PATHS, FieldPath
+from .code_enum import MieleEnum
+from .model import MieleDevice
+
+# MieleDevice properties holding codes that consumers map through enums
+DEVICE_ENUM_FIELDS = (
+    "device_type",
+    "state_status",
+    "state_program_id",
+    "state_program_type",
+    "state_program_phase",
+    "state_drying_step",
+    "state_ventilation_step",
+)
+
+# An enum class, or enum classes keyed by device type for codes that
+# depend on the appliance, such as program phases
+EnumSpec = type[MieleEnum] | Mapping[int, type[MieleEnum]]
+
+
+class MieleDecodedState:
+    """Enum members for the coded fields of one device."""
+
+    __slots__ = ("serial", "unknown", "values")
+
+    def __init__(
+        self,
+        serial: str,
+        values: dict[str, MieleEnum | None],
+        unknown: dict[str, int],
+    ) -> None:
+        """Initialize MieleDecodedState."""
+        self.serial = serial
+        self.values = values
+        self.unknown = unknown
+
+    def get(self, field: str) -> MieleEnum | None:
+        """Return the decoded member for a field, None if not decoded."""
+        return self.values.get(field)
+
+    def __getattr__(self, field: str) -> MieleEnum | None:
+        """Return the decoded member for a field by attribute."""
+        try:
+            return self.values[field]
+        except KeyError:
+            raise AttributeError(field) from None
+
+    def __repr__(self) -> str:
+        """Return representation."""
+        return f"MieleDecodedState({self.serial!r}, {self.values!r}, unknown={self.unknown!r})"
+
+
+class MieleStateDecoder:
+    """Resolve enum-typed device fields with cached lookup tables."""
+
+    def __init__(self, enums: Mapping[str, EnumSpec]) -> None:
+        """Initialize MieleStateDecoder with enum classes per field name."""
+        self._fields: list[tuple[str, FieldPath, EnumSpec]] = []
+        for field, spec in enums.items():
+            if field not in DEVICE_ENUM_FIELDS:
+                raise ValueError(f"Not an enum-coded MieleDevice property: {field}")
+            self._fields.append((field, DEVICE_PROPERTY_PATHS[field], spec))
+        # Codes not known by the enums, collected here instead of logged
+        self.unknown_codes: set[tuple[str, int]] = set()
+
+    def decode(self, serial: str, device: MieleDevice | dict) -> MieleDecodedState:
+        """Decode all configured fields of a device."""
+        raw = device.raw_data if isinstance(device, MieleDevice) else device
+        device_type = _lookup(raw, DEVICE_PROPERTY_PATHS["device_type"])
+        values: dict[str, MieleEnum | None] = {}
+        unknown: dict[str, int] = {}
+        for field, path, spec in self._fields:
+            code = _lookup(raw, path)
+            if code is None:
+                values[field] = None
+                continue
+            enum = spec if isinstance(spec, type) else spec.get(device_type)
+            if enum is None:
+                values[field] = None
+                unknown[field] = code
+                continue
+            member = enum.lookup_table().get(code)
+            if member is None:
+                member = enum.fallback()
+                unknown[field] = code
+                self.unknown_codes.add((enum.__name__, code))
+            values[field] = member
+        return MieleDecodedState(serial, values, unknown)
+
+    def decode_all(self, data: Mapping[str, Any]) -> dict[str, MieleDecodedState]:
+        """Decode every device in a devices response or event."""
+        return {
+            serial: self.decode(serial, payload) for serial, payload in data.items()
+        }
+
+
+def _lookup(raw: Any, path: FieldPath) -> Any:
+    for key in path:
+        try:
+            raw = raw[key]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return raw
@@ -0,0 +1,80 @@
+"""Run event callbacks in an executor, away from the event stream reader."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import Executor
+import logging
+from typing import Any
+
+from .const import DISPATCH_QUEUE_SIZE, DISPATCH_WORKERS
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MieleEventDispatcher:
+    """Queue decoded events and hand them to plain callables in an executor."""
+
+    # Callables for a ProcessPoolExecutor must be picklable module level functions.
+
+    def __init__(
+        self,
+        executor: Executor | None = None,
+        data_callback: Callable[[dict[str, Any]], Any] | None = None,
+        actions_callback: Callable[[dict[str, Any]], Any] | None = None,
+        queue_size: int = DISPATCH_QUEUE_SIZE,
+        workers: int = DISPATCH_WORKERS,
+    ) -> None:
+        """Initialize MieleEventDispatcher, executor None uses the loop default."""
+        self.executor = executor
+        self.data_callback = data_callback
+        self.actions_callback = actions_callback
+        self.workers = workers
+        self.dropped = 0
+        self._queue: asyncio.Queue[tuple[Callable[[dict[str, Any]], Any], dict]] = (
+            asyncio.Queue(queue_size)
+        )
+        self._tasks: list[asyncio.Task[None]] = []
+
+    async def async_handle_devices(self, data: dict[str, Any]) -> None:
+        """Queue a devices event, usable as listen_events data_callback."""
+        if self.data_callback is not None:
+            self._put(self.data_callback, data)
+
+    async def async_handle_actions(self, data: dict[str, Any]) -> None:
+        """Queue an actions event, usable as listen_events actions_callback."""
+        if self.actions_callback is not None:
+            self._put(self.actions_callback, data)
+
+    async def close(self) -> None:
+        """Wait for queued events to finish and stop the workers."""
+        if self._tasks:
+            await self._queue.join()
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    def _put(self, callback: Callable[[dict[str, Any]], Any], data: dict) -> None:
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._worker()) for _ in range(self.workers)
+            ]
+        # Never make the reader wait, shed load when consumers fall behind
+        try:
+            self._queue.put_nowait((callback, data))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 100 == 0:
+                _LOGGER.warning("Dispatch queue full, dropped %s events", self.dropped)
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            callback, data = await self._queue.get()
+            try:
+                await loop.run_in_executor(self.executor, callback, data)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error in dispatched callback")
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,71 @@
+"""Deduplication of strings and common sub-objects in decoded payloads."""
+
+from __future__ import annotations
+
+import json
+import sys
+from typing import Any
+
+# Shape of localized value objects such as status, programPhase and type.
+# Model setters replace these objects instead of mutating them, so one
+# instance can safely be shared between devices.
+LOCALIZED_KEYS = frozenset({"value_raw", "value_localized", "key_localized"})
+
+
+class MieleInterner:
+    """Share repeated strings and localized value objects between payloads."""
+
+    def __init__(self) -> None:
+        """Initialize MieleInterner."""
+        self._strings: dict[str, str] = {}
+        self._objects: dict[tuple, dict] = {}
+
+    @property
+    def strings(self) -> int:
+        """Return number of distinct interned string values."""
+        return len(self._strings)
+
+    @property
+    def objects(self) -> int:
+        """Return number of distinct shared objects."""
+        return len(self._objects)
+
+    def clear(self) -> None:
+        """Forget all shared values, already decoded payloads keep theirs."""
+        self._strings.clear()
+        self._objects.clear()
+
+    def string(self, value: str) -> str:
+        """Return the shared instance of a string value."""
+        return self._strings.setdefault(value, value)
+
+    def object_pairs_hook(self, pairs: list[tuple[str, Any]]) -> dict[str, Any]:
+        """Build a dict with interned keys and values, usable with json.loads."""
+        obj = {
+            sys.intern(key): self.string(value) if isinstance(value, str) else value
+            for key, value in pairs
+        }
+        if obj.keys() == LOCALIZED_KEYS:
+            signature = tuple(obj.items())
+            try:
+                return self._objects.setdefault(signature, obj)
+            except TypeError:
+                # Unhashable value, keep this object private
+                return obj
+        return obj
+
+    def loads(self, data: str | bytes) -> Any:
+        """Decode JSON with interning applied."""
+        return json.loads(data, object_pairs_hook=self.object_pairs_hook)
+
+    def intern(self, data: Any) -> Any:
+        """Return a copy of already decoded data with interning applied."""
+        if isinstance(data, dict):
+            return self.object_pairs_hook(
+                [(key, self.intern(value)) for key, value in data.items()]
+            )
+        if isinstance(data, list):
+            return [self.intern(item) for item in data]
+        if isinstance(data, str):
+            return self.string(data)
+        return data
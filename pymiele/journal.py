@@ -0,0 +1,278 @@
+"""File-backed command journal for delivery across API outages."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import json
+import logging
+import os
+from pathlib import Path
+import random
+import time
+from typing import TYPE_CHECKING, Any
+import uuid
+
+from aiohttp import ClientError, ClientResponseError
+
+from .batch import MieleCommand, MieleCommandResult
+from .const import JOURNAL_MAX_AGE, JOURNAL_RETRY_INITIAL, JOURNAL_RETRY_MAX
+from .pymiele import MieleException
+
+if TYPE_CHECKING:
+    from .pymiele import AbstractAuth
+
+OUTCOME_SENT = "sent"
+OUTCOME_FAILED = "failed"
+OUTCOME_SUPERSEDED = "superseded"
+OUTCOME_EXPIRED = "expired"
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MieleJournalOutcome(MieleCommandResult):
+    """Final result of a journaled command."""
+
+    __slots__ = ("entry_id", "outcome")
+
+    def __init__(
+        self,
+        entry_id: str,
+        serial: str,
+        command: MieleCommand,
+        outcome: str,
+        status: int | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        """Initialize MieleJournalOutcome."""
+        super().__init__(serial, command, status, error)
+        self.entry_id = entry_id
+        self.outcome = outcome
+
+    @property
+    def success(self) -> bool:
+        """Return True if the command was accepted by the API."""
+        return self.outcome == OUTCOME_SENT
+
+
+class _JournalEntry:
+    """A command waiting for delivery."""
+
+    __slots__ = ("attempts", "command", "created", "entry_id", "serial")
+
+    def __init__(
+        self, entry_id: str, serial: str, command: MieleCommand, created: float
+    ) -> None:
+        self.entry_id = entry_id
+        self.serial = serial
+        self.command = command
+        self.created = created
+        self.attempts = 0
+
+    def record(self) -> dict[str, Any]:
+        return {
+            "op": "add",
+            "id": self.entry_id,
+            "serial": self.serial,
+            "kind": self.command.kind,
+            "data": self.command.data,
+            "created": self.created,
+        }
+
+
+class MieleCommandJournal:
+    """Queue commands in a journal file and deliver them in order with backoff."""
+
+    # The file is a JSON lines log of "add" and "end" records. Pending entries
+    # are rebuilt from it on start, and it is compacted to just those entries.
+
+    def __init__(
+        self,
+        auth: AbstractAuth,
+        path: str | Path,
+        outcome_callback: Callable[[MieleJournalOutcome], Any] | None = None,
+        max_age: float = JOURNAL_MAX_AGE,
+        retry_initial: float = JOURNAL_RETRY_INITIAL,
+        retry_max: float = JOURNAL_RETRY_MAX,
+    ) -> None:
+        """Initialize MieleCommandJournal and load pending commands from path."""
+        self.auth = auth
+        self.path = Path(path)
+        self.outcome_callback = outcome_callback
+        self.max_age = max_age
+        self.retry_initial = retry_initial
+        self.retry_max = retry_max
+        self.pending: dict[str, _JournalEntry] = {}
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._inflight: str | None = None
+        self._load()
+
+    async def submit(self, serial: str, command: MieleCommand) -> str:
+        """Journal a command for delivery and return its entry id."""
+        entry = _JournalEntry(uuid.uuid4().hex, serial, command, time.time())
+        async with self._lock:
+            await self._write(json.dumps(entry.record()) + "\n")
+            # Queue and supersede only once the add record is on disk, and
+            # under the lock so that a concurrent _finish cannot truncate it
+            self.pending[entry.entry_id] = entry
+            stale = [
+                old
+                for old in self.pending.values()
+                if old is not entry
+                and old.entry_id != self._inflight
+                and self._supersedes(entry, old)
+            ]
+            for old in stale:
+                del self.pending[old.entry_id]
+            if stale:
+                await self._write(
+                    "".join(self._end_line(old, OUTCOME_SUPERSEDED) for old in stale)
+                )
+        for old in stale:
+            self._notify(old, OUTCOME_SUPERSEDED)
+        self._wakeup.set()
+        return entry.entry_id
+
+    async def run(self) -> None:
+        """Deliver journaled commands until cancelled."""
+        delay = self.retry_initial
+        while True:
+            if not self.pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            entry = next(iter(self.pending.values()))
+            if time.time() - entry.created > self.max_age:
+                await self._finish(entry, OUTCOME_EXPIRED)
+                continue
+            self._inflight = entry.entry_id
+            try:
+                status = await entry.command.send(self.auth, entry.serial)
+            except ClientResponseError as ex:
+                if ex.status < 500 and ex.status != 429:
+                    await self._finish(entry, OUTCOME_FAILED, ex.status, ex)
+                    continue
+                error: BaseException = ex
+            except MieleException as ex:
+                await self._finish(entry, OUTCOME_FAILED, None, ex)
+                continue
+            except (TimeoutError, ClientError) as ex:
+                error = ex
+            except Exception as ex:  # pylint: disable=broad-except
+                _LOGGER.exception("Unexpected error sending %s", entry.command)
+                await self._finish(entry, OUTCOME_FAILED, None, ex)
+                continue
+            else:
+                delay = self.retry_initial
+                await self._finish(entry, OUTCOME_SENT, status)
+                continue
+            finally:
+                self._inflight = None
+            entry.attempts += 1
+            if any(
+                self._supersedes(newer, entry)
+                for newer in self.pending.values()
+                if newer is not entry
+            ):
+                # A newer command replaces this one, do not retry a stale value
+                await self._finish(entry, OUTCOME_SUPERSEDED, None, error)
+            else:
+                _LOGGER.debug(
+                    "Command %s for %s failed (attempt %s): %s, retrying in %.0fs",
+                    entry.command,
+                    entry.serial,
+                    entry.attempts,
+                    error,
+                    delay,
+                )
+            # The API is likely unavailable, pause the whole queue so that
+            # commands go out one by one instead of in a burst on recovery
+            await asyncio.sleep(delay * random.uniform(0.8, 1.2))
+            delay = min(delay * 2, self.retry_max)
+
+    @staticmethod
+    def _supersedes(entry: _JournalEntry, old: _JournalEntry) -> bool:
+        key = entry.command.supersede_key
+        return (
+            key is not None
+            and entry.serial == old.serial
+            and key == old.command.supersede_key
+        )
+
+    async def _finish(
+        self,
+        entry: _JournalEntry,
+        outcome: str,
+        status: int | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        if self.pending.pop(entry.entry_id, None) is None:
+            return
+        async with self._lock:
+            # With nothing pending the journal is emptied to keep it small.
+            # Decided under the lock so a concurrent submit is never lost.
+            if self.pending:
+                await self._write(self._end_line(entry, outcome))
+            else:
+                await self._write("", truncate=True)
+        self._notify(entry, outcome, status, error)
+
+    def _notify(
+        self,
+        entry: _JournalEntry,
+        outcome: str,
+        status: int | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        if self.outcome_callback is None:
+            return
+        result = MieleJournalOutcome(
+            entry.entry_id, entry.serial, entry.command, outcome, status, error
+        )
+        try:
+            self.outcome_callback(result)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error in journal outcome callback")
+
+    @staticmethod
+    def _end_line(entry: _JournalEntry, outcome: str) -> str:
+        return (
+            json.dumps({"op": "end", "id": entry.entry_id, "outcome": outcome}) + "\n"
+        )
+
+    async def _write(self, data: str, truncate: bool = False) -> None:
+        await asyncio.to_thread(self._write_file, data, "w" if truncate else "a")
+
+    def _write_file(self, data: str, mode: str) -> None:
+        with self.path.open(mode, encoding="utf-8") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        with self.path.open(encoding="utf-8") as file:
+            for row in file:
+                try:
+                    record = json.loads(row)
+                except ValueError:
+                    # Torn write from a crash, nothing after it is usable
+                    break
+                if record["op"] == "add":
+                    command = MieleCommand(record["kind"], record["data"])
+                    self.pending[record["id"]] = _JournalEntry(
+                        record["id"], record["serial"], command, record["created"]
+                    )
+                elif record["op"] == "end":
+                    self.pending.pop(record["id"], None)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with tmp.open("w", encoding="utf-8") as file:
+            for entry in self.pending.values():
+                file.write(json.dumps(entry.record()) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+        tmp.replace(self.path)
+        if self.pending:
+            _LOGGER.debug("Loaded %s pending commands", len(self.pending))
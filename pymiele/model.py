@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .intern import MieleInterner
+
 
 class MieleDevices:
     """Data for all devices from API."""
 
-    def __init__(self, raw_data: dict) -> None:
+    def __init__(self, raw_data: dict, interner: MieleInterner | None = None) -> None:
         """Initialize MieleDevices."""
-        self.raw_data = raw_data
+        self.raw_data = raw_data if interner is None else interner.intern(raw_data)
 
     @property
     def devices(self) -> list[str]:
@@ -416,7 +421,11 @@ class MieleDevice:
     @state_drying_step.setter
     def state_drying_step(self, new_value: int) -> None:
         """Set the drying state."""
-        self.raw_data["state"]["dryingStep"]["value_raw"] = new_value
+        # Replace rather than mutate, the object may be shared by MieleInterner
+        self.raw_data["state"]["dryingStep"] = {
+            **self.raw_data["state"]["dryingStep"],
+            "value_raw": new_value,
+        }
 
     @property
     def state_ventilation_step(self) -> int | None:
@@ -430,7 +439,11 @@ class MieleDevice:
     @state_ventilation_step.setter
     def state_ventilation_step(self, new_value: int) -> None:
         """Set the ventilation state."""
-        self.raw_data["state"]["ventilationStep"]["value_raw"] = new_value
+        # Replace rather than mutate, the object may be shared by MieleInterner
+        self.raw_data["state"]["ventilationStep"] = {
+            **self.raw_data["state"]["ventilationStep"],
+            "value_raw": new_value,
+        }
 
     @property
     def state_plate_step(self) -> list[MielePlateStep]:
@@ -632,7 +645,7 @@ class MieleAction:
 class MieleProgramsAvailable:
     """Model for available programs."""
 
-    def __init__(self, raw_data: dict) -> None:
+    def __init__(self, raw_data: list[dict]) -> None:
         """Initialize MieleProgramsAvailable."""
         self.raw_data = raw_data
 
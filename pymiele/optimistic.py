@@ -0,0 +1,258 @@
+"""Optimistic local updates for commands."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import ClientResponse
+
+from .changes import FieldPath
+from .const import OPTIMISTIC_TIMEOUT
+from .model import MieleAction, MieleDevice
+
+if TYPE_CHECKING:
+    from .capabilities import MieleCapabilities
+    from .pymiele import AbstractAuth
+
+_LOGGER = logging.getLogger(__name__)
+
+
+_MISSING = object()
+
+
+def _get_path(data: Any, path: FieldPath) -> Any:
+    try:
+        for key in path:
+            data = data[key]
+    except (KeyError, IndexError, TypeError):
+        return _MISSING
+    return data
+
+
+def _set_path(data: Any, path: FieldPath, value: Any) -> Any:
+    """Return a copy of data with the value at path replaced."""
+    # Copy on write, payload objects may be shared by MieleInterner or consumers
+    if not path:
+        return value
+    head, rest = path[0], path[1:]
+    copied = list(data) if isinstance(data, list) else dict(data)
+    copied[head] = _set_path(data[head], rest, value) if rest else value  # type: ignore[index]
+    return copied
+
+
+def _apply(raw: dict, path: FieldPath, value: Any) -> dict:
+    raw = _set_path(raw, path, value)
+    if path[1] == "targetTemperature":
+        # value_raw is in hundredths of a degree
+        raw = _set_path(raw, (*path[:-1], "value_localized"), value / 100)
+    return raw
+
+
+class _Pending:
+    """Patched values of a device and the latest values reported for it."""
+
+    __slots__ = ("action_patches", "actions", "device_patches", "handle", "state")
+
+    def __init__(self, state: dict | None, actions: dict | None) -> None:
+        self.state = state
+        self.actions = actions
+        self.device_patches: dict[FieldPath, Any] = {}
+        self.action_patches: dict[FieldPath, Any] = {}
+        self.handle: asyncio.TimerHandle | None = None
+
+
+class MieleOptimisticUpdater:
+    """Send commands and patch the local device and action objects at once."""
+
+    # Patched fields are re-applied on top of events until an event reports
+    # the patched values, or rolled back when the command fails or no such
+    # event arrives in time.
+
+    def __init__(
+        self,
+        auth: AbstractAuth,
+        devices: dict[str, MieleDevice] | None = None,
+        actions: dict[str, MieleAction] | None = None,
+        data_callback: Callable[[dict[str, Any]], Any] | None = None,
+        actions_callback: Callable[[dict[str, Any]], Any] | None = None,
+        rollback_after: float | None = OPTIMISTIC_TIMEOUT,
+    ) -> None:
+        """Initialize MieleOptimisticUpdater."""
+        self.auth = auth
+        self.devices = devices if devices is not None else {}
+        self.actions = actions if actions is not None else {}
+        self.data_callback = data_callback
+        self.actions_callback = actions_callback
+        self.rollback_after = rollback_after
+        self._pending: dict[str, _Pending] = {}
+
+    def is_pending(self, serial: str) -> bool:
+        """Return True if the device shows unconfirmed optimistic values."""
+        return serial in self._pending
+
+    async def send_action(
+        self,
+        serial: str,
+        data: dict[str, str | int | bool],
+        *,
+        capabilities: MieleCapabilities | None = None,
+    ) -> ClientResponse:
+        """Send action command and apply its expected effect locally."""
+        if capabilities is not None:
+            capabilities.validate_action(data)
+        self._snapshot(serial)
+        if "light" in data:
+            self._patch_device(serial, ("state", "light"), int(data["light"]))
+        if "ambientLight" in data:
+            self._patch_device(
+                serial, ("state", "ambientLight"), bool(data["ambientLight"])
+            )
+        if "ventilationStep" in data:
+            self._patch_device(
+                serial,
+                ("state", "ventilationStep", "value_raw"),
+                int(data["ventilationStep"]),
+            )
+        if data.get("powerOn"):
+            self._patch_action(serial, ("powerOn",), False)
+            self._patch_action(serial, ("powerOff",), True)
+        if data.get("powerOff"):
+            self._patch_action(serial, ("powerOn",), True)
+            self._patch_action(serial, ("powerOff",), False)
+        return await self._send(serial, self.auth.send_action(serial, data))
+
+    async def set_target_temperature(
+        self,
+        serial: str,
+        temperature: float,
+        zone: int = 1,
+        *,
+        capabilities: MieleCapabilities | None = None,
+    ) -> ClientResponse:
+        """Set target temperature and show it locally at once."""
+        temp = round(temperature)
+        if capabilities is not None:
+            capabilities.validate_target_temperature(temp, zone)
+        self._snapshot(serial)
+        if zone > 0:
+            self._patch_device(
+                serial,
+                ("state", "targetTemperature", zone - 1, "value_raw"),
+                temp * 100,
+            )
+        return await self._send(
+            serial, self.auth.set_target_temperature(serial, temperature, zone)
+        )
+
+    async def async_handle_devices(self, data: dict[str, Any]) -> None:
+        """Apply a devices event, usable as listen_events data_callback."""
+        data = {
+            serial: self._merge(serial, payload, True)
+            for serial, payload in data.items()
+        }
+        for serial, payload in data.items():
+            if (device := self.devices.get(serial)) is not None:
+                device.raw_data = payload
+            else:
+                self.devices[serial] = MieleDevice(payload)
+        if self.data_callback is not None:
+            await self.data_callback(data)
+
+    async def async_handle_actions(self, data: dict[str, Any]) -> None:
+        """Apply an actions event, usable as listen_events actions_callback."""
+        data = {
+            serial: self._merge(serial, payload, False)
+            for serial, payload in data.items()
+        }
+        for serial, payload in data.items():
+            if (action := self.actions.get(serial)) is not None:
+                action.raw_data = payload
+            else:
+                self.actions[serial] = MieleAction(payload)
+        if self.actions_callback is not None:
+            await self.actions_callback(data)
+
+    def rollback(self, serial: str) -> None:
+        """Restore the values last reported for the device, dropping the patches."""
+        if (pending := self._pending.pop(serial, None)) is None:
+            return
+        if pending.handle is not None:
+            pending.handle.cancel()
+        if (
+            device := self.devices.get(serial)
+        ) is not None and pending.state is not None:
+            device.raw_data = pending.state
+        if (
+            action := self.actions.get(serial)
+        ) is not None and pending.actions is not None:
+            action.raw_data = pending.actions
+        _LOGGER.debug("Rolled back optimistic update for %s", serial)
+
+    def _snapshot(self, serial: str) -> None:
+        if serial in self._pending:
+            return
+        device = self.devices.get(serial)
+        action = self.actions.get(serial)
+        # Patches never mutate these dicts, so no deep copy is needed
+        self._pending[serial] = _Pending(
+            device.raw_data if device is not None else None,
+            action.raw_data if action is not None else None,
+        )
+
+    def _patch_device(self, serial: str, path: FieldPath, value: Any) -> None:
+        device = self.devices.get(serial)
+        # Only patch fields the device reports, a missing key is fine
+        if device is None or not isinstance(
+            _get_path(device.raw_data, path[:-1]), dict
+        ):
+            return
+        self._pending[serial].device_patches[path] = value
+        device.raw_data = _apply(device.raw_data, path, value)
+
+    def _patch_action(self, serial: str, path: FieldPath, value: Any) -> None:
+        if (action := self.actions.get(serial)) is None:
+            return
+        self._pending[serial].action_patches[path] = value
+        action.raw_data = _set_path(action.raw_data, path, value)
+
+    def _merge(self, serial: str, payload: dict, device: bool) -> dict:
+        """Return the payload with unconfirmed patches of the device applied."""
+        if (pending := self._pending.get(serial)) is None:
+            return payload
+        if device:
+            pending.state = payload
+            patches = pending.device_patches
+        else:
+            pending.actions = payload
+            patches = pending.action_patches
+        for path, value in list(patches.items()):
+            if _get_path(payload, path) == value:
+                del patches[path]
+            elif device:
+                payload = _apply(payload, path, value)
+            else:
+                payload = _set_path(payload, path, value)
+        if not pending.device_patches and not pending.action_patches:
+            _LOGGER.debug("Optimistic update for %s confirmed", serial)
+            del self._pending[serial]
+            if pending.handle is not None:
+                pending.handle.cancel()
+        return payload
+
+    async def _send(self, serial: str, request: Any) -> ClientResponse:
+        try:
+            res = await request
+        except BaseException:
+            self.rollback(serial)
+            raise
+        pending = self._pending.get(serial)
+        if pending is not None and self.rollback_after is not None:
+            if pending.handle is not None:
+                pending.handle.cancel()
+            pending.handle = asyncio.get_running_loop().call_later(
+                self.rollback_after, self.rollback, serial
+            )
+        return res
@@ -0,0 +1,171 @@
+"""Profiling of the event pipeline and model properties."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Coroutine
+import cProfile
+from pathlib import Path
+import time
+from typing import Any
+
+from .model import MieleAction, MieleDevice
+
+STAGE_READ = "read"
+STAGE_DECODE = "decode"
+STAGE_DISPATCH = "dispatch"
+STAGE_CALLBACK = "callback"
+
+
+class MieleTiming:
+    """Aggregated timings for one stage or property."""
+
+    __slots__ = ("count", "max", "total")
+
+    def __init__(self) -> None:
+        """Initialize MieleTiming."""
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        """Add one sample."""
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    @property
+    def mean(self) -> float:
+        """Return mean time in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+
+class MieleProfiler:
+    """Collect per-stage and per-property timings, dump them on demand."""
+
+    def __init__(self) -> None:
+        """Initialize MieleProfiler."""
+        self.timings: dict[str, MieleTiming] = {}
+        self._patched: dict[tuple[type, str], property] = {}
+        self._cprofile: cProfile.Profile | None = None
+
+    def record(self, name: str, seconds: float) -> None:
+        """Add a sample for a stage or property."""
+        if (timing := self.timings.get(name)) is None:
+            timing = self.timings[name] = MieleTiming()
+        timing.add(seconds)
+
+    def reset(self) -> None:
+        """Forget all samples."""
+        self.timings.clear()
+
+    def wrap_function(self, func: Callable[..., Any], name: str) -> Callable[..., Any]:
+        """Return func timed under name."""
+
+        def timed(*args: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                self.record(name, time.perf_counter() - start)
+
+        return timed
+
+    def wrap_callback(
+        self, callback: Callable[[dict[str, Any]], Any] | None
+    ) -> Callable[[dict[str, Any]], Coroutine[Any, Any, Any]] | None:
+        """Return callback timing the wait to be scheduled and its own run time."""
+        if callback is None:
+            return None
+
+        def dispatch(data: dict[str, Any]) -> Coroutine[Any, Any, Any]:
+            return run(data, time.perf_counter())
+
+        async def run(data: dict[str, Any], created: float) -> Any:
+            start = time.perf_counter()
+            self.record(STAGE_DISPATCH, start - created)
+            try:
+                return await callback(data)
+            finally:
+                self.record(STAGE_CALLBACK, time.perf_counter() - start)
+
+        return dispatch
+
+    def wrap_stream(self, content: Any) -> _ProfilingStream:
+        """Return a stream timing reads of event data lines."""
+        return _ProfilingStream(content, self)
+
+    def instrument_model(self) -> None:
+        """Time every MieleDevice and MieleAction property until restore_model."""
+        if self._patched:
+            # Already instrumented, wrapping again would lose the originals
+            return
+        for cls in (MieleDevice, MieleAction):
+            for name, attr in list(vars(cls).items()):
+                if not isinstance(attr, property) or attr.fget is None:
+                    continue
+                self._patched[(cls, name)] = attr
+                timed_get = self.wrap_function(attr.fget, f"{cls.__name__}.{name}")
+                setattr(
+                    cls, name, property(timed_get, attr.fset, attr.fdel, attr.__doc__)
+                )
+
+    def restore_model(self) -> None:
+        """Remove the property instrumentation."""
+        for (cls, name), attr in self._patched.items():
+            setattr(cls, name, attr)
+        self._patched.clear()
+
+    def start_cprofile(self) -> None:
+        """Start collecting cProfile statistics."""
+        if self._cprofile is None:
+            self._cprofile = cProfile.Profile()
+        self._cprofile.enable()
+
+    def stop_cprofile(self) -> None:
+        """Pause collecting cProfile statistics."""
+        if self._cprofile is not None:
+            self._cprofile.disable()
+
+    def dump_cprofile(self, path: str | Path) -> None:
+        """Write cProfile statistics for pstats or snakeviz."""
+        if self._cprofile is None:
+            raise RuntimeError("cProfile was not started")
+        self._cprofile.dump_stats(str(path))
+
+    def report(self) -> str:
+        """Return a table of timings sorted by total time."""
+        lines = [
+            f"{'name':<48}{'count':>10}{'total ms':>12}{'mean us':>12}{'max us':>12}"
+        ]
+        for name, timing in sorted(
+            self.timings.items(), key=lambda item: item[1].total, reverse=True
+        ):
+            lines.append(
+                f"{name:<48}{timing.count:>10}{timing.total * 1e3:>12.2f}"
+                f"{timing.mean * 1e6:>12.1f}{timing.max * 1e6:>12.1f}"
+            )
+        return "\n".join(lines)
+
+    def collapsed(self) -> str:
+        """Return timings in collapsed stack format for flamegraph tools."""
+        lines = []
+        for name, timing in self.timings.items():
+            stack = ";".join(["pymiele", *name.split(".")])
+            lines.append(f"{stack} {round(timing.total * 1e6)}")
+        return "\n".join(lines)
+
+
+class _ProfilingStream:
+    """Stream wrapper recording the time spent reading data lines."""
+
+    def __init__(self, content: Any, profiler: MieleProfiler) -> None:
+        self._content = content
+        self._profiler = profiler
+
+    async def readline(self) -> bytes:
+        start = time.perf_counter()
+        line: bytes = await self._content.readline()
+        # Event and blank lines mostly measure idle waiting, skip them
+        if line.startswith(b"data:"):
+            self._profiler.record(STAGE_READ, time.perf_counter() - start)
+        return line
@@ -4,15 +4,30 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 import asyncio
-from collections.abc import Callable, Coroutine
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Coroutine
+from contextlib import asynccontextmanager
 import json
 from json.decoder import JSONDecodeError
 import logging
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from aiohttp import ClientResponse, ClientResponseError, ClientSession, ClientTimeout
 
-from .const import AIO_TIMEOUT, MIELE_API, VERSION
+from .const import (
+    AIO_TIMEOUT,
+    EVENT_CONNECT_TIMEOUT,
+    EVENT_PING_TIMEOUT,
+    MIELE_API,
+    VERSION,
+)
+from .model import MieleDevice
+from .stream import iter_json_object
+
+if TYPE_CHECKING:
+    from .capabilities import MieleCapabilities
+    from .intern import MieleInterner
+    from .profiling import MieleProfiler
+    from .replay import MieleEventRecorder
 
 CONTENT_TYPE = "application/json"
 USER_AGENT_BASE = f"Pymiele/{VERSION}"
@@ -23,10 +38,36 @@ _LOGGER = logging.getLogger(__name__)
 class AbstractAuth(ABC):
     """Abstract class to make authenticated requests."""
 
-    def __init__(self, websession: ClientSession, host: str) -> None:
+    def __init__(
+        self,
+        websession: ClientSession,
+        host: str,
+        *,
+        event_websession: ClientSession | None = None,
+        timeouts: dict[str, float] | None = None,
+        interner: MieleInterner | None = None,
+        event_url: str | None = None,
+    ) -> None:
         """Initialize the auth."""
         self.websession = websession
         self.host = host
+        # A separate session keeps the long-lived event stream out of the REST pool
+        self.event_websession = event_websession
+        self.timeouts = timeouts or {}
+        # Optional deduplication of device payloads from /devices and events
+        self.interner = interner
+        # Override to reach the event stream through a proxy or a local stub
+        self.event_url = event_url or f"{MIELE_API}/devices/all/events"
+
+    def timeout(self, name: str) -> float:
+        """Return the timeout for an endpoint method, defaults to AIO_TIMEOUT."""
+        return self.timeouts.get(name, AIO_TIMEOUT)
+
+    def json_loads(self, data: str | bytes) -> Any:
+        """Decode device JSON, interned if an interner is set."""
+        if self.interner is not None:
+            return self.interner.loads(data)
+        return json.loads(data)
 
     @abstractmethod
     async def async_get_access_token(self) -> str:
@@ -59,16 +100,49 @@ class AbstractAuth(ABC):
 
     async def get_devices(self) -> dict:
         """Get all devices."""
-        async with asyncio.timeout(AIO_TIMEOUT):
+        async with asyncio.timeout(self.timeout("get_devices")):
+            res = await self.request(
+                "GET", "/devices", headers={"Accept": "application/json"}
+            )
+            res.raise_for_status()
+        return await res.json(loads=self.json_loads)
+
+    async def iter_devices(self) -> AsyncGenerator[tuple[str, MieleDevice]]:
+        """Get all devices, yielding each one as soon as it is received."""
+        async with asyncio.timeout(self.timeout("get_devices")):
             res = await self.request(
                 "GET", "/devices", headers={"Accept": "application/json"}
             )
             res.raise_for_status()
-        return await res.json()
+
+        async def chunks() -> AsyncIterator[bytes]:
+            while True:
+                async with asyncio.timeout(self.timeout("get_devices")):
+                    chunk = await res.content.readany()
+                if not chunk:
+                    return
+                yield chunk
+
+        try:
+            async for serial, data in iter_json_object(chunks(), self.json_loads):
+                yield serial, MieleDevice(data)
+        finally:
+            res.release()
+
+    async def get_device(self, serial: str) -> dict:
+        """Get a single device."""
+        async with asyncio.timeout(self.timeout("get_device")):
+            res = await self.request(
+                "GET",
+                f"/devices/{serial}",
+                headers={"Accept": "application/json"},
+            )
+            res.raise_for_status()
+        return await res.json(loads=self.json_loads)
 
     async def get_actions(self, serial: str) -> dict:
         """Get actions for a device."""
-        async with asyncio.timeout(AIO_TIMEOUT):
+        async with asyncio.timeout(self.timeout("get_actions")):
             res = await self.request(
                 "GET",
                 f"/devices/{serial}/actions",
@@ -79,7 +153,7 @@ class AbstractAuth(ABC):
 
     async def get_programs(self, serial: str) -> dict:
         """Get programs for a device."""
-        async with asyncio.timeout(AIO_TIMEOUT):
+        async with asyncio.timeout(self.timeout("get_programs")):
             res = await self.request(
                 "GET",
                 f"/devices/{serial}/programs",
@@ -90,7 +164,7 @@ class AbstractAuth(ABC):
 
     async def get_rooms(self, serial: str) -> dict:
         """Get rooms for a device."""
-        async with asyncio.timeout(AIO_TIMEOUT):
+        async with asyncio.timeout(self.timeout("get_rooms")):
             res = await self.request(
                 "GET",
                 f"/devices/{serial}/rooms",
@@ -100,11 +174,18 @@ class AbstractAuth(ABC):
         return await res.json()
 
     async def set_target_temperature(
-        self, serial: str, temperature: float, zone: int = 1
+        self,
+        serial: str,
+        temperature: float,
+        zone: int = 1,
+        *,
+        capabilities: MieleCapabilities | None = None,
     ) -> ClientResponse:
         """Set target temperature."""
         temp = round(temperature)
-        async with asyncio.timeout(AIO_TIMEOUT):
+        if capabilities is not None:
+            capabilities.validate_target_temperature(temp, zone)
+        async with asyncio.timeout(self.timeout("set_target_temperature")):
             data = {"targetTemperature": [{"zone": zone, "value": temp}]}
             res = await self.request(
                 "PUT",
@@ -120,12 +201,18 @@ class AbstractAuth(ABC):
         return res
 
     async def send_action(
-        self, serial: str, data: dict[str, str | int | bool]
+        self,
+        serial: str,
+        data: dict[str, str | int | bool],
+        *,
+        capabilities: MieleCapabilities | None = None,
     ) -> ClientResponse:
         """Send action command."""
+        if capabilities is not None:
+            capabilities.validate_action(data)
 
         _LOGGER.debug("send_action serial: %s, data: %s", serial, data)
-        async with asyncio.timeout(AIO_TIMEOUT):
+        async with asyncio.timeout(self.timeout("send_action")):
             res = await self.request(
                 "PUT",
                 f"/devices/{serial}/actions",
@@ -140,12 +227,18 @@ class AbstractAuth(ABC):
         return res
 
     async def set_program(
-        self, serial: str, data: dict[str, int | list[int]]
+        self,
+        serial: str,
+        data: dict[str, int | list[int]],
+        *,
+        capabilities: MieleCapabilities | None = None,
     ) -> ClientResponse:
         """Send start program command."""
+        if capabilities is not None:
+            capabilities.validate_program(data)
 
         _LOGGER.debug("set_program serial: %s, data: %s", serial, data)
-        async with asyncio.timeout(AIO_TIMEOUT):
+        async with asyncio.timeout(self.timeout("set_program")):
             res = await self.request(
                 "PUT",
                 f"/devices/{serial}/programs",
@@ -165,7 +258,7 @@ class AbstractAuth(ABC):
         """Send start in room command."""
 
         _LOGGER.debug("set_room serial: %s, data: %s", serial, data)
-        async with asyncio.timeout(AIO_TIMEOUT):
+        async with asyncio.timeout(self.timeout("set_room")):
             res = await self.request(
                 "PUT",
                 f"/devices/{serial}/rooms",
@@ -179,56 +272,90 @@ class AbstractAuth(ABC):
         _LOGGER.debug("set_room res: %s", res.status)
         return res
 
+    @asynccontextmanager
+    async def open_event_stream(self) -> AsyncIterator[Any]:
+        """Open the server-sent event stream and yield the response."""
+        access_token = await self.async_get_access_token()
+        websession = self.event_websession or self.websession
+        async with websession.get(
+            self.event_url,
+            timeout=ClientTimeout(
+                total=None,
+                sock_connect=self.timeouts.get("event_connect", EVENT_CONNECT_TIMEOUT),
+                sock_read=None,
+            ),
+            headers={
+                "Accept": "text/event-stream; char-set=utf-8",
+                "Authorization": f"Bearer {access_token}",
+            },
+        ) as resp:
+            yield resp
+
     async def listen_events(
         self,
         data_callback: Callable[[dict[str, Any]], Any] | None = None,
         actions_callback: Callable[[dict[str, Any]], Any] | None = None,
+        *,
+        recorder: MieleEventRecorder | None = None,
+        connection_callback: Callable[[bool], None] | None = None,
+        profiler: MieleProfiler | None = None,
     ) -> Callable[[], Coroutine[Any, Any, None]]:
         """Listen to events, apply changes to object and call callback with event."""
+        loads = self.json_loads
+        if profiler is not None:
+            loads = profiler.wrap_function(loads, "decode")
+            data_callback = profiler.wrap_callback(data_callback)
+            actions_callback = profiler.wrap_callback(actions_callback)
         while True:
             try:
-                access_token = await self.async_get_access_token()
-                async with self.websession.get(
-                    f"{MIELE_API}/devices/all/events",
-                    timeout=ClientTimeout(total=None, sock_connect=5, sock_read=None),
-                    headers={
-                        "Accept": "text/event-stream; char-set=utf-8",
-                        "Authorization": f"Bearer {access_token}",
-                    },
-                ) as resp:
+                async with self.open_event_stream() as resp:
                     # _LOGGER.debug("Starting listening for events: %s", resp.status)
-                    while True:
-                        # add 120s timeout for reading event data, ping is every 20s
-                        # if ping is not received, then connection must be closed and re-initialized
-                        try:
-                            id_line = await asyncio.wait_for(
-                                resp.content.readline(), timeout=120
-                            )
-                        except asyncio.exceptions.TimeoutError:
-                            resp.close()
-                            _LOGGER.warning(
-                                "Ping timeout, closing connection and restarting"
-                            )
-                            break
-                        data_line = await resp.content.readline()
-                        await resp.content.readline()  # Empty line
-                        if resp.closed:
-                            _LOGGER.warning("Connection was closed, restarting")
-                            break
-                        event_type = bytearray(id_line).decode().strip()
-                        if event_type == "event: devices":
-                            data = json.loads(data_line[6:])
-                            if data_callback is not None:
-                                asyncio.create_task(data_callback(data))  # noqa: RUF006
-                        elif event_type == "event: actions":
-                            data = json.loads(data_line[6:])
-                            if actions_callback is not None:
-                                asyncio.create_task(actions_callback(data))  # noqa: RUF006
-                        elif event_type == "event: ping":
-                            # _LOGGER.debug("Ping SSE")
-                            pass
-                        else:
-                            _LOGGER.error("Unknown event type: %s", event_type)
+                    if connection_callback is not None:
+                        connection_callback(True)
+                    try:
+                        content = resp.content
+                        if recorder is not None:
+                            content = recorder.wrap(content)
+                        if profiler is not None:
+                            content = profiler.wrap_stream(content)
+                        while True:
+                            # add 120s timeout for reading event data, ping is every 20s
+                            # if ping is not received, then connection must be closed and re-initialized
+                            try:
+                                id_line = await asyncio.wait_for(
+                                    content.readline(),
+                                    timeout=self.timeouts.get(
+                                        "event_ping", EVENT_PING_TIMEOUT
+                                    ),
+                                )
+                            except asyncio.exceptions.TimeoutError:
+                                resp.close()
+                                _LOGGER.warning(
+                                    "Ping timeout, closing connection and restarting"
+                                )
+                                break
+                            data_line = await content.readline()
+                            await content.readline()  # Empty line
+                            if resp.closed:
+                                _LOGGER.warning("Connection was closed, restarting")
+                                break
+                            event_type = bytearray(id_line).decode().strip()
+                            if event_type == "event: devices":
+                                data = loads(data_line[6:])
+                                if data_callback is not None:
+                                    asyncio.create_task(data_callback(data))  # noqa: RUF006
+                            elif event_type == "event: actions":
+                                data = loads(data_line[6:])
+                                if actions_callback is not None:
+                                    asyncio.create_task(actions_callback(data))  # noqa: RUF006
+                            elif event_type == "event: ping":
+                                # _LOGGER.debug("Ping SSE")
+                                pass
+                            else:
+                                _LOGGER.error("Unknown event type: %s", event_type)
+                    finally:
+                        if connection_callback is not None:
+                            connection_callback(False)
 
             except ClientResponseError as ex:
                 _LOGGER.error("SSE: %s - %s", ex.status, ex.message)
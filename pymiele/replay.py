@@ -0,0 +1,211 @@
+"""Record and replay of the server-sent event stream."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable, Coroutine
+from contextlib import asynccontextmanager
+import json
+from pathlib import Path
+import time
+from typing import Any
+
+from .const import MIELE_API
+from .pymiele import AbstractAuth
+
+
+class MieleEventRecorder:
+    """Capture raw event stream lines with their arrival time."""
+
+    def __init__(self, lines: list[tuple[float, bytes]] | None = None) -> None:
+        """Initialize MieleEventRecorder."""
+        self.lines: list[tuple[float, bytes]] = lines if lines is not None else []
+        self._start: float | None = None
+
+    def wrap(self, content: Any) -> _RecordingStream:
+        """Return a stream that records every line read from content."""
+        return _RecordingStream(content, self)
+
+    def record(self, line: bytes) -> None:
+        """Store a line with its offset from the first recorded line."""
+        now = time.monotonic()
+        if self._start is None:
+            self._start = now
+        self.lines.append((now - self._start, bytes(line)))
+
+    def save(self, path: str | Path) -> None:
+        """Write the recording as JSON lines."""
+        with Path(path).open("w", encoding="utf-8") as file:
+            for offset, line in self.lines:
+                entry = {
+                    "t": round(offset, 6),
+                    "line": line.decode("utf-8", errors="surrogateescape"),
+                }
+                file.write(json.dumps(entry) + "\n")
+
+    @classmethod
+    def load(cls, path: str | Path) -> MieleEventRecorder:
+        """Read a recording written by save."""
+        lines = []
+        with Path(path).open(encoding="utf-8") as file:
+            for row in file:
+                if not row.strip():
+                    continue
+                entry = json.loads(row)
+                lines.append(
+                    (
+                        float(entry["t"]),
+                        entry["line"].encode("utf-8", errors="surrogateescape"),
+                    )
+                )
+        return cls(lines)
+
+
+class _RecordingStream:
+    """Stream wrapper that passes lines through to a recorder."""
+
+    def __init__(self, content: Any, recorder: MieleEventRecorder) -> None:
+        self._content = content
+        self._recorder = recorder
+
+    async def readline(self) -> bytes:
+        line: bytes = await self._content.readline()
+        if line:
+            self._recorder.record(line)
+        return line
+
+
+class _ReplayResponse:
+    """Response look-alike that serves recorded lines on a schedule."""
+
+    def __init__(self, lines: list[tuple[float, bytes]], speed: float) -> None:
+        self.content = self
+        self.closed = False
+        self.last_read = 0.0
+        self._lines = iter(lines)
+        self._speed = speed
+        self._start = time.monotonic()
+
+    async def readline(self) -> bytes:
+        try:
+            offset, line = next(self._lines)
+        except StopIteration:
+            self.closed = True
+            return b""
+        if self._speed > 0:
+            delay = self._start + offset / self._speed - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        if line.strip():
+            self.last_read = time.monotonic()
+        return line
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class MieleReplayStats:
+    """Throughput and callback latency measured during a replay."""
+
+    def __init__(self, events: int, elapsed: float, latencies: list[float]) -> None:
+        """Initialize MieleReplayStats."""
+        self.events = events
+        self.elapsed = elapsed
+        self.latencies = sorted(latencies)
+
+    @property
+    def events_per_second(self) -> float:
+        """Return the number of events delivered per second."""
+        return self.events / self.elapsed if self.elapsed > 0 else 0.0
+
+    def latency_percentile(self, percentile: float) -> float | None:
+        """Return callback latency in seconds at the given percentile (0-100)."""
+        if not self.latencies:
+            return None
+        index = round(percentile / 100 * (len(self.latencies) - 1))
+        return self.latencies[index]
+
+    def __repr__(self) -> str:
+        """Return representation."""
+        return (
+            f"MieleReplayStats(events={self.events}, elapsed={self.elapsed:.3f}, "
+            f"p50={self.latency_percentile(50)}, p99={self.latency_percentile(99)})"
+        )
+
+
+class MieleReplayAuth(AbstractAuth):
+    """Auth that feeds a recorded event stream through listen_events."""
+
+    def __init__(
+        self,
+        recording: MieleEventRecorder,
+        speed: float = 1.0,
+        websession: Any = None,
+        host: str = MIELE_API,
+    ) -> None:
+        """Initialize MieleReplayAuth, speed 0 replays without delays."""
+        super().__init__(websession, host)
+        self.recording = recording
+        self.speed = speed
+        self.finished = asyncio.Event()
+        self._response: _ReplayResponse | None = None
+
+    async def async_get_access_token(self) -> str:
+        """Return a dummy access token."""
+        return "replay"
+
+    @asynccontextmanager
+    async def open_event_stream(self) -> AsyncIterator[Any]:
+        """Yield the recorded stream once, then block until cancelled."""
+        if self._response is not None:
+            self.finished.set()
+            await asyncio.Event().wait()
+        self._response = _ReplayResponse(self.recording.lines, self.speed)
+        yield self._response
+
+    async def replay(
+        self,
+        data_callback: Callable[[dict[str, Any]], Any] | None = None,
+        actions_callback: Callable[[dict[str, Any]], Any] | None = None,
+    ) -> MieleReplayStats:
+        """Replay the recording through listen_events and return statistics."""
+        latencies: list[float] = []
+        pending = 0
+        idle = asyncio.Event()
+        idle.set()
+
+        def timed(
+            callback: Callable[[dict[str, Any]], Any] | None,
+        ) -> Callable[[dict[str, Any]], Coroutine[Any, Any, None]]:
+            def dispatch(data: dict[str, Any]) -> Coroutine[Any, Any, None]:
+                nonlocal pending
+                read_at = self._response.last_read if self._response else 0.0
+                pending += 1
+                idle.clear()
+                return run(data, read_at)
+
+            async def run(data: dict[str, Any], read_at: float) -> None:
+                nonlocal pending
+                try:
+                    if callback is not None:
+                        await callback(data)
+                finally:
+                    latencies.append(time.monotonic() - read_at)
+                    pending -= 1
+                    if pending == 0:
+                        idle.set()
+
+            return dispatch
+
+        self.finished.clear()
+        self._response = None
+        start = time.monotonic()
+        task = asyncio.create_task(
+            self.listen_events(timed(data_callback), timed(actions_callback))
+        )
+        try:
+            await self.finished.wait()
+            await idle.wait()
+        finally:
+            task.cancel()
+        return MieleReplayStats(len(latencies), time.monotonic() - start, latencies)
@@ -0,0 +1,43 @@
+"""Tuned HTTP sessions for the Miele API."""
+
+from __future__ import annotations
+
+from aiohttp import ClientSession, TCPConnector
+
+from .const import (
+    SESSION_DNS_TTL,
+    SESSION_KEEPALIVE,
+    SESSION_LIMIT,
+    SESSION_LIMIT_PER_HOST,
+)
+
+
+def create_session(
+    limit: int = SESSION_LIMIT,
+    limit_per_host: int = SESSION_LIMIT_PER_HOST,
+    dns_ttl: int = SESSION_DNS_TTL,
+    keepalive: float = SESSION_KEEPALIVE,
+) -> ClientSession:
+    """Return a session for REST calls with pooling, keep-alive and DNS cache."""
+    connector = TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        ttl_dns_cache=dns_ttl,
+        keepalive_timeout=keepalive,
+    )
+    return ClientSession(connector=connector)
+
+
+def create_event_session(
+    limit: int = 0,
+    dns_ttl: int = SESSION_DNS_TTL,
+) -> ClientSession:
+    """Return a session reserved for long-lived event streams."""
+    # Each stream holds its connection for hours, so it is never reused and
+    # should not count against the REST pool. limit=0 means no limit.
+    connector = TCPConnector(
+        limit=limit,
+        ttl_dns_cache=dns_ttl,
+        force_close=True,
+    )
+    return ClientSession(connector=connector)
@@ -0,0 +1,141 @@
+"""Incremental decoding of large JSON objects."""
+
+from __future__ import annotations
+
+import codecs
+from collections.abc import AsyncIterator, Callable
+import json
+from typing import Any
+
+WHITESPACE = " \t\r\n"
+
+
+class JSONObjectStreamParser:
+    """Split a top-level JSON object into (key, value) pairs as text arrives."""
+
+    # Each member value is located by scanning brackets and strings, and only
+    # then decoded, so the buffer never holds more than one member at a time.
+
+    def __init__(self, loads: Callable[[str], Any] = json.loads) -> None:
+        """Initialize JSONObjectStreamParser."""
+        self.loads = loads
+        self.done = False
+        self._buffer = ""
+        self._state = "start"
+        self._key: str | None = None
+        self._scan = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, text: str) -> list[tuple[str, Any]]:
+        """Add text and return the members that are now complete."""
+        self._buffer += text
+        members: list[tuple[str, Any]] = []
+        while not self.done and self._step(members):
+            pass
+        return members
+
+    def _skip_whitespace(self) -> bool:
+        buffer = self._buffer
+        pos = 0
+        while pos < len(buffer) and buffer[pos] in WHITESPACE:
+            pos += 1
+        self._buffer = buffer[pos:]
+        return bool(self._buffer)
+
+    def _step(self, members: list[tuple[str, Any]]) -> bool:
+        """Advance one state, return False when more text is needed."""
+        if self._state in ("start", "key", "colon") and not self._skip_whitespace():
+            return False
+        if self._state == "start":
+            if self._buffer[0] != "{":
+                raise ValueError("Expected a JSON object")
+            self._buffer = self._buffer[1:]
+            self._state = "key"
+            return True
+        if self._state == "key":
+            char = self._buffer[0]
+            if char == "}":
+                self._buffer = self._buffer[1:]
+                self.done = True
+                return False
+            if char == ",":
+                self._buffer = self._buffer[1:]
+                return True
+            if (end := self._find_end()) is None:
+                return False
+            self._key = json.loads(self._buffer[:end])
+            self._buffer = self._buffer[end:]
+            self._state = "colon"
+            return True
+        if self._state == "colon":
+            if self._buffer[0] != ":":
+                raise ValueError("Expected ':' after object key")
+            self._buffer = self._buffer[1:]
+            self._state = "value"
+            return True
+        if not self._skip_whitespace():
+            return False
+        if (end := self._find_end()) is None:
+            return False
+        members.append((str(self._key), self.loads(self._buffer[:end])))
+        self._buffer = self._buffer[end:]
+        self._key = None
+        self._state = "key"
+        return True
+
+    def _find_end(self) -> int | None:
+        """Return end offset of the value at the buffer start, None if incomplete."""
+        buffer = self._buffer
+        first = buffer[0]
+        pos = self._scan
+        if pos == 0:
+            self._depth = 0
+            self._in_string = False
+            self._escape = False
+        while pos < len(buffer):
+            char = buffer[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 0 and first == '"':
+                        self._scan = 0
+                        return pos + 1
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 0:
+                    self._scan = 0
+                    return pos
+                self._depth -= 1
+                if self._depth == 0:
+                    self._scan = 0
+                    return pos + 1
+            elif char == "," and self._depth == 0:
+                self._scan = 0
+                return pos
+            pos += 1
+        self._scan = pos
+        return None
+
+
+async def iter_json_object(
+    chunks: AsyncIterator[bytes], loads: Callable[[str], Any] = json.loads
+) -> AsyncIterator[tuple[str, Any]]:
+    """Yield (key, value) pairs of a top-level JSON object read from chunks."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    parser = JSONObjectStreamParser(loads)
+    async for chunk in chunks:
+        for member in parser.feed(decoder.decode(chunk)):
+            yield member
+    for member in parser.feed(decoder.decode(b"", final=True)):
+        yield member
+    if not parser.done:
+        raise ValueError("Incomplete JSON object")
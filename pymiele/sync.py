@@ -0,0 +1,207 @@
+"""Synchronous client running the async API on a background loop."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Coroutine, Iterator
+from concurrent.futures import Future
+import logging
+import queue
+import threading
+from typing import Any, TypeVar
+
+from aiohttp import ClientResponse, ClientSession
+
+from .batch import BATCH_PARALLEL, MieleCommand, MieleCommandResult, execute_batch
+from .capabilities import MieleCapabilities
+from .model import MieleDevice
+from .pymiele import AbstractAuth
+from .session import create_event_session, create_session
+
+EVENT_DEVICES = "devices"
+EVENT_ACTIONS = "actions"
+
+_T = TypeVar("_T")
+_STOP = object()
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class MieleSyncClient:
+    """Blocking client that owns one event loop thread and one ClientSession."""
+
+    def __init__(
+        self,
+        auth_factory: Callable[[ClientSession], AbstractAuth],
+        event_queue_size: int = 0,
+    ) -> None:
+        """Initialize MieleSyncClient and start the loop thread."""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="pymiele-sync", daemon=True
+        )
+        self._thread.start()
+        self._events: queue.Queue[Any] = queue.Queue(event_queue_size)
+        self._listener: Future[Any] | None = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+        async def setup() -> tuple[ClientSession, ClientSession, AbstractAuth]:
+            websession = create_session()
+            event_websession = create_event_session()
+            auth = auth_factory(websession)
+            if auth.event_websession is None:
+                auth.event_websession = event_websession
+            return websession, event_websession, auth
+
+        self.websession, self.event_websession, self.auth = self.run(setup())
+
+    def run(self, coro: Coroutine[Any, Any, _T], timeout: float | None = None) -> _T:
+        """Run a coroutine on the client loop and wait for the result."""
+        if self._closed:
+            raise RuntimeError("MieleSyncClient is closed")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    def get_devices(self) -> dict:
+        """Get all devices."""
+        return self.run(self.auth.get_devices())
+
+    def get_device(self, serial: str) -> dict:
+        """Get a single device."""
+        return self.run(self.auth.get_device(serial))
+
+    def iter_devices(self) -> Iterator[tuple[str, MieleDevice]]:
+        """Get all devices, yielding each one as soon as it is received."""
+        devices = self.auth.iter_devices()
+
+        async def step() -> Any:
+            return await anext(devices, _STOP)
+
+        try:
+            while (item := self.run(step())) is not _STOP:
+                yield item
+        finally:
+            if not self._closed:
+                self.run(devices.aclose())
+
+    def get_actions(self, serial: str) -> dict:
+        """Get actions for a device."""
+        return self.run(self.auth.get_actions(serial))
+
+    def get_programs(self, serial: str) -> dict:
+        """Get programs for a device."""
+        return self.run(self.auth.get_programs(serial))
+
+    def get_rooms(self, serial: str) -> dict:
+        """Get rooms for a device."""
+        return self.run(self.auth.get_rooms(serial))
+
+    def set_target_temperature(
+        self,
+        serial: str,
+        temperature: float,
+        zone: int = 1,
+        *,
+        capabilities: MieleCapabilities | None = None,
+    ) -> ClientResponse:
+        """Set target temperature."""
+        return self.run(
+            self.auth.set_target_temperature(
+                serial, temperature, zone, capabilities=capabilities
+            )
+        )
+
+    def send_action(
+        self,
+        serial: str,
+        data: dict[str, str | int | bool],
+        *,
+        capabilities: MieleCapabilities | None = None,
+    ) -> ClientResponse:
+        """Send action command."""
+        return self.run(self.auth.send_action(serial, data, capabilities=capabilities))
+
+    def set_program(
+        self,
+        serial: str,
+        data: dict[str, int | list[int]],
+        *,
+        capabilities: MieleCapabilities | None = None,
+    ) -> ClientResponse:
+        """Send start program command."""
+        return self.run(self.auth.set_program(serial, data, capabilities=capabilities))
+
+    def set_room(self, serial: str, data: dict[str, int | list[int]]) -> ClientResponse:
+        """Send start in room command."""
+        return self.run(self.auth.set_room(serial, data))
+
+    def execute_batch(
+        self,
+        commands: list[tuple[str, MieleCommand]],
+        max_parallel: int = BATCH_PARALLEL,
+    ) -> list[MieleCommandResult]:
+        """Send commands concurrently and return one result per command."""
+        return self.run(execute_batch(self.auth, commands, max_parallel))
+
+    def events(self, timeout: float | None = None) -> Iterator[tuple[str, dict]]:
+        """Yield (event type, data) tuples from the event stream."""
+        # All threads iterating share one queue, each event is delivered once.
+        self._start_listener()
+        while True:
+            try:
+                item = self._events.get(timeout=timeout)
+            except queue.Empty:
+                return
+            if item is _STOP:
+                self._events.put(_STOP)
+                return
+            yield item
+
+    def _start_listener(self) -> None:
+        with self._lock:
+            if self._listener is not None:
+                return
+
+            async def on_devices(data: dict[str, Any]) -> None:
+                self._put_event((EVENT_DEVICES, data))
+
+            async def on_actions(data: dict[str, Any]) -> None:
+                self._put_event((EVENT_ACTIONS, data))
+
+            self._listener = asyncio.run_coroutine_threadsafe(
+                self.auth.listen_events(on_devices, on_actions), self._loop
+            )
+
+    def _put_event(self, item: Any) -> None:
+        # Never block the loop thread, drop events when consumers fall behind
+        try:
+            self._events.put_nowait(item)
+        except queue.Full:
+            _LOGGER.warning("Event queue full, dropping %s event", item[0])
+
+    def close(self) -> None:
+        """Stop listening, close the session and stop the loop thread."""
+        if self._closed:
+            return
+        if self._listener is not None:
+            self._listener.cancel()
+        self.run(self.websession.close())
+        self.run(self.event_websession.close())
+        self._closed = True
+        while True:
+            try:
+                self._events.put_nowait(_STOP)
+                break
+            except queue.Full:
+                self._events.get_nowait()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self) -> MieleSyncClient:
+        """Enter context."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Close on context exit."""
+        self.close()
@@ -0,0 +1,101 @@
+"""Compare memory of decoded device payloads with and without interning."""
+
+import argparse
+import json
+import sys
+import tracemalloc
+
+from pymiele import MieleInterner
+
+
+def localized(value_raw: int, value_localized: str, key_localized: str) -> dict:
+    """Return a localized value object as sent by the API."""
+    return {
+        "value_raw": value_raw,
+        "value_localized": value_localized,
+        "key_localized": key_localized,
+    }
+
+
+def idle_device(serial: str) -> dict:
+    """Return a typical payload for an idle washing machine."""
+    temperature = {"value_raw": -32768, "value_localized": None, "unit": "Celsius"}
+    return {
+        "ident": {
+            "type": localized(1, "Washing machine", "Device type"),
+            "deviceName": "",
+            "protocolVersion": 4,
+            "deviceIdentLabel": {
+                "fabNumber": serial,
+                "fabIndex": "44",
+                "techType": "WCI870",
+                "matNumber": "11387290",
+                "swids": ["5975", "20456", "25213", "25191", "25446", "25033"],
+            },
+            "xkmIdentLabel": {"techType": "EK057", "releaseVersion": "08.32"},
+        },
+        "state": {
+            "ProgramID": localized(0, "", "Program name"),
+            "status": localized(1, "Off", "status"),
+            "programType": localized(0, "", "Program type"),
+            "programPhase": localized(0, "", "Program phase"),
+            "remainingTime": [0, 0],
+            "startTime": [0, 0],
+            "targetTemperature": [dict(temperature) for _ in range(3)],
+            "coreTargetTemperature": [],
+            "temperature": [dict(temperature) for _ in range(3)],
+            "coreTemperature": [],
+            "signalInfo": False,
+            "signalFailure": False,
+            "signalDoor": False,
+            "remoteEnable": {
+                "fullRemoteControl": True,
+                "smartGrid": False,
+                "mobileStart": False,
+            },
+            "ambientLight": None,
+            "light": 0,
+            "elapsedTime": [0, 0],
+            "spinningSpeed": localized(1400, "1400", "Spin speed"),
+            "dryingStep": localized(None, "", "Drying level"),
+            "ventilationStep": localized(None, "", "Fan level"),
+            "plateStep": [],
+            "ecoFeedback": None,
+            "batteryLevel": None,
+        },
+    }
+
+
+def measure(document: str, loads: object) -> int:
+    """Return bytes held by the decoded document."""
+    tracemalloc.start()
+    data = loads(document)  # type: ignore[operator]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+    return size
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--devices", type=int, default=1000)
+    args = parser.parse_args()
+
+    document = json.dumps(
+        {f"{i:012d}": idle_device(f"{i:012d}") for i in range(args.devices)}
+    )
+    plain = measure(document, json.loads)
+    interner = MieleInterner()
+    interned = measure(document, interner.loads)
+    sys.stdout.write(
+        f"devices: {args.devices}\n"
+        f"json.loads: {plain / 1024:.0f} KiB ({plain / args.devices:.0f} B/device)\n"
+        f"interned: {interned / 1024:.0f} KiB ({interned / args.devices:.0f} B/device)\n"
+        f"saved: {100 * (plain - interned) / plain:.1f}%"
+        f" ({interner.strings} strings, {interner.objects} objects shared)\n"
+    )
+
+
+if __name__ == "__main__":
+    main()
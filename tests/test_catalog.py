@@ -0,0 +1,138 @@
+"""Tests for the shared program catalog."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from pymiele import MieleDevice, MieleProgramCatalog
+
+PROGRAMS = [{"programId": 1, "program": "Cottons"}, {"programId": 2, "program": "Eco"}]
+
+
+def device(firmware: str = "08.32") -> MieleDevice:
+    """Return a washing machine with a firmware version."""
+    return MieleDevice(
+        {
+            "ident": {
+                "deviceIdentLabel": {"techType": "WCI870"},
+                "xkmIdentLabel": {"releaseVersion": firmware},
+            }
+        }
+    )
+
+
+class FakeAuth:
+    """Auth answering program requests per serial, optionally held at a gate."""
+
+    def __init__(self, answers: dict[str, Any] | None = None) -> None:
+        """Initialize FakeAuth."""
+        self.answers = answers or {}
+        self.calls: list[str] = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def get_programs(self, serial: str) -> list[dict[str, Any]]:
+        """Return the programs of a device."""
+        self.calls.append(serial)
+        await self.gate.wait()
+        answer = self.answers.get(serial, PROGRAMS)
+        if isinstance(answer, BaseException):
+            raise answer
+        return list(answer)
+
+
+def test_in_flight_fetch_shared() -> None:
+    """Devices of one model share a single request."""
+    auth = FakeAuth()
+
+    async def run() -> None:
+        catalog = MieleProgramCatalog(auth)  # type: ignore[arg-type]
+        auth.gate.clear()
+        first = asyncio.create_task(catalog.get_programs("a", device()))
+        second = asyncio.create_task(catalog.get_programs("b", device()))
+        await asyncio.sleep(0)
+        auth.gate.set()
+        entries = await asyncio.gather(first, second)
+        assert entries[0] is entries[1]
+        assert entries[0].get(2).program_id == 2  # type: ignore[union-attr]
+        assert await catalog.get_programs("c", device()) is entries[0]
+        assert auth.calls == ["a"]
+
+    asyncio.run(run())
+
+
+def test_cancelled_fetcher_taken_over() -> None:
+    """A waiter fetches itself when the fetching task is cancelled."""
+    auth = FakeAuth()
+
+    async def run() -> None:
+        catalog = MieleProgramCatalog(auth)  # type: ignore[arg-type]
+        auth.gate.clear()
+        fetcher = asyncio.create_task(catalog.get_programs("a", device()))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(catalog.get_programs("b", device()))
+        await asyncio.sleep(0)
+        fetcher.cancel()
+        await asyncio.sleep(0)
+        auth.gate.set()
+        entry = await waiter
+        assert fetcher.cancelled()
+        assert len(entry.programs.programs) == 2
+        assert auth.calls == ["a", "b"]
+
+    asyncio.run(run())
+
+
+def test_failed_fetch_falls_back() -> None:
+    """A waiter fetches for its own device when the shared fetch fails."""
+    auth = FakeAuth({"a": TimeoutError()})
+
+    async def run() -> None:
+        catalog = MieleProgramCatalog(auth)  # type: ignore[arg-type]
+        auth.gate.clear()
+        fetcher = asyncio.create_task(catalog.get_programs("a", device()))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(catalog.get_programs("b", device()))
+        await asyncio.sleep(0)
+        auth.gate.set()
+        with pytest.raises(TimeoutError):
+            await fetcher
+        assert len((await waiter).programs.programs) == 2
+        assert auth.calls == ["a", "b"]
+
+    asyncio.run(run())
+
+
+def test_empty_list_not_cached() -> None:
+    """A device listing no programs does not hide them from others."""
+    auth = FakeAuth({"a": []})
+
+    async def run() -> None:
+        catalog = MieleProgramCatalog(auth)  # type: ignore[arg-type]
+        assert (await catalog.get_programs("a", device())).programs.programs == []
+        assert catalog.entries == {}
+        assert len((await catalog.get_programs("b", device())).programs.programs) == 2
+        assert auth.calls == ["a", "b"]
+
+    asyncio.run(run())
+
+
+def test_firmware_change_drops_unused_entry() -> None:
+    """An entry is dropped once no device runs that firmware anymore."""
+    auth = FakeAuth()
+
+    async def run() -> None:
+        catalog = MieleProgramCatalog(auth)  # type: ignore[arg-type]
+        old = await catalog.get_programs("a", device())
+        await catalog.get_programs("b", device())
+        catalog.update_device("a", device("09.00"))
+        assert old.key in catalog.entries
+        catalog.update_device("b", device("09.00"))
+        assert old.key not in catalog.entries
+        await catalog.get_programs("a", device("09.00"))
+        assert auth.calls == ["a", "a"]
+
+    asyncio.run(run())
@@ -0,0 +1,116 @@
+"""Tests for coalescing of devices and actions events."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+
+import pytest
+
+from pymiele import MieleDeviceUpdate, MieleEventCoalescer
+
+DEVICE = {"state": {"status": {"value_raw": 5}}}
+ACTIONS = {"powerOn": False, "powerOff": True}
+
+
+async def wait_until(condition: Callable[[], bool]) -> None:
+    """Wait for a condition to become true."""
+    for _ in range(2000):
+        if condition():
+            return
+        await asyncio.sleep(0.001)
+    raise TimeoutError
+
+
+def make_coalescer(
+    window: float = 0.05,
+) -> tuple[MieleEventCoalescer, list[dict[str, MieleDeviceUpdate]]]:
+    """Return a coalescer collecting delivered updates."""
+    delivered: list[dict[str, MieleDeviceUpdate]] = []
+
+    async def on_updates(updates: dict[str, MieleDeviceUpdate]) -> None:
+        delivered.append(updates)
+
+    return MieleEventCoalescer(on_updates, window), delivered
+
+
+def test_complete_pair_flushed_immediately() -> None:
+    """A device with both halves is delivered without waiting for the window."""
+
+    async def run() -> None:
+        coalescer, delivered = make_coalescer(window=10)
+        await coalescer.async_handle_devices({"a": DEVICE, "b": DEVICE})
+        await coalescer.async_handle_actions({"a": ACTIONS})
+        await wait_until(lambda: len(delivered) == 1)
+        assert list(delivered[0]) == ["a"]
+        update = delivered[0]["a"]
+        assert update.complete
+        assert update.actions is not None
+        assert update.actions.power_off_enabled
+        # The incomplete device keeps the window running
+        assert coalescer._timer is not None  # noqa: SLF001
+        coalescer.flush()
+        await wait_until(lambda: len(delivered) == 2)
+        assert not delivered[1]["b"].complete
+
+    asyncio.run(run())
+
+
+def test_window_flushes_partial_updates() -> None:
+    """Events within the window are merged and delivered once it expires."""
+
+    async def run() -> None:
+        coalescer, delivered = make_coalescer()
+        await coalescer.async_handle_devices({"a": DEVICE})
+        await coalescer.async_handle_devices({"b": DEVICE})
+        await asyncio.sleep(0.01)
+        assert delivered == []
+        await wait_until(lambda: len(delivered) == 1)
+        assert sorted(delivered[0]) == ["a", "b"]
+        assert delivered[0]["a"].device is not None
+        assert delivered[0]["a"].actions is None
+        assert coalescer._timer is None  # noqa: SLF001
+
+        # A new event after the flush starts a new window
+        await coalescer.async_handle_actions({"a": ACTIONS})
+        await wait_until(lambda: len(delivered) == 2)
+        assert delivered[1]["a"].device is None
+
+    asyncio.run(run())
+
+
+def test_timer_cancelled_when_all_complete() -> None:
+    """No flush is left scheduled once every pending device is complete."""
+
+    async def run() -> None:
+        coalescer, delivered = make_coalescer(window=10)
+        await coalescer.async_handle_actions({"a": ACTIONS})
+        assert coalescer._timer is not None  # noqa: SLF001
+        await coalescer.async_handle_devices({"a": DEVICE})
+        assert coalescer._timer is None  # noqa: SLF001
+        await wait_until(lambda: len(delivered) == 1)
+
+    asyncio.run(run())
+
+
+def test_callback_error_logged(caplog: pytest.LogCaptureFixture) -> None:
+    """A failing callback is logged and later updates are still delivered."""
+    calls = 0
+
+    async def run() -> None:
+        async def failing(updates: dict[str, MieleDeviceUpdate]) -> None:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise RuntimeError("consumer bug")
+
+        coalescer = MieleEventCoalescer(failing, 10)
+        await coalescer.async_handle_devices({"a": DEVICE})
+        await coalescer.async_handle_actions({"a": ACTIONS})
+        await wait_until(lambda: calls == 1)
+        await coalescer.async_handle_devices({"a": DEVICE})
+        await coalescer.async_handle_actions({"a": ACTIONS})
+        await wait_until(lambda: calls == 2)
+
+    asyncio.run(run())
+    assert "Error in coalesced update callback" in caplog.text
@@ -0,0 +1,256 @@
+"""Tests for the event stream coordinator."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+
+from pymiele import MieleEventCoordinator
+
+RUNNING = 5
+OFF = 1
+
+
+def payload(status: int, remaining: int = 0) -> dict[str, Any]:
+    """Return a device payload."""
+    return {"state": {"status": {"value_raw": status}, "remainingTime": [0, remaining]}}
+
+
+class FakeAuth:
+    """Auth serving devices from a dict, with an event stream driven by the test."""
+
+    def __init__(self, devices: dict[str, dict[str, Any]]) -> None:
+        """Initialize FakeAuth."""
+        self.devices = devices
+        self.polls = 0
+        self.fetched: list[str] = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+        self.poll_error: BaseException | None = None
+        self.connection_callback: Callable[[bool], None] | None = None
+        self.data_callback: Callable[[dict[str, Any]], Any] | None = None
+
+    async def get_devices(self) -> dict[str, Any]:
+        """Return all devices."""
+        self.polls += 1
+        if (error := self.poll_error) is not None:
+            self.poll_error = None
+            raise error
+        return {serial: dict(data) for serial, data in self.devices.items()}
+
+    async def get_device(self, serial: str) -> dict[str, Any]:
+        """Return one device once the gate is open."""
+        self.fetched.append(serial)
+        await self.gate.wait()
+        return dict(self.devices[serial])
+
+    async def get_actions(self, serial: str) -> dict[str, Any]:
+        """Return the actions of a device."""
+        return {}
+
+    async def listen_events(
+        self,
+        data_callback: Callable[[dict[str, Any]], Any],
+        actions_callback: Any = None,
+        *,
+        connection_callback: Callable[[bool], None],
+    ) -> None:
+        """Hand the callbacks to the test and wait."""
+        self.data_callback = data_callback
+        self.connection_callback = connection_callback
+        await asyncio.Event().wait()
+
+
+async def wait_until(condition: Callable[[], bool]) -> None:
+    """Wait for a condition to become true."""
+    for _ in range(2000):
+        if condition():
+            return
+        await asyncio.sleep(0.001)
+    raise TimeoutError
+
+
+def make_coordinator(
+    auth: FakeAuth, **kwargs: Any
+) -> tuple[MieleEventCoordinator, list[dict[str, Any]]]:
+    """Return a coordinator collecting delivered updates."""
+    delivered: list[dict[str, Any]] = []
+
+    async def on_devices(data: dict[str, Any]) -> None:
+        delivered.append(data)
+
+    kwargs.setdefault("grace", 0.02)
+    kwargs.setdefault("fast_interval", 0.01)
+    kwargs.setdefault("slow_interval", 0.01)
+    coordinator = MieleEventCoordinator(
+        auth,  # type: ignore[arg-type]
+        on_devices,
+        on_devices,
+        **kwargs,
+    )
+    return coordinator, delivered
+
+
+def test_poll_after_grace_until_connected() -> None:
+    """Polling starts after the grace period and stops on connect."""
+    auth = FakeAuth({"a": payload(OFF)})
+
+    async def run() -> None:
+        coordinator, delivered = make_coordinator(auth)
+        task = asyncio.create_task(coordinator.run())
+        await asyncio.sleep(0.005)
+        assert auth.polls == 0
+        await wait_until(lambda: auth.polls >= 3)
+        # Identical polls are delivered once
+        assert delivered == [{"a": payload(OFF)}]
+        assert coordinator.polling
+
+        assert auth.connection_callback is not None
+        auth.connection_callback(True)
+        polls = auth.polls
+        await asyncio.sleep(0.03)
+        assert auth.polls == polls
+        assert not coordinator.polling
+        task.cancel()
+
+    asyncio.run(run())
+
+
+def test_poll_survives_errors() -> None:
+    """Decode and callback errors do not stop the poller."""
+    auth = FakeAuth({"a": payload(OFF)})
+    auth.poll_error = ValueError("bad json")
+    calls = 0
+
+    async def run() -> None:
+        nonlocal calls
+        coordinator, _ = make_coordinator(auth)
+
+        async def failing(data: dict[str, Any]) -> None:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise RuntimeError("consumer bug")
+
+        coordinator.data_callback = failing
+        task = asyncio.create_task(coordinator.run())
+        await wait_until(lambda: calls == 1)
+        auth.devices["a"] = payload(RUNNING)
+        await wait_until(lambda: calls == 2)
+        assert coordinator.polling
+        task.cancel()
+
+    asyncio.run(run())
+
+
+def test_payloads_are_copied() -> None:
+    """A consumer mutating a delivered payload does not hide later changes."""
+
+    async def run() -> None:
+        coordinator, delivered = make_coordinator(FakeAuth({}))
+        await coordinator._deliver({"a": payload(OFF)})  # noqa: SLF001
+        delivered[0]["a"]["state"]["status"]["value_raw"] = RUNNING
+        await coordinator._deliver({"a": payload(RUNNING)})  # noqa: SLF001
+        assert len(delivered) == 2
+
+    asyncio.run(run())
+
+
+def test_targeted_resync_after_gap() -> None:
+    """A short gap refetches active devices not already seen on the new stream."""
+    auth = FakeAuth({"a": payload(RUNNING), "b": payload(RUNNING), "c": payload(OFF)})
+
+    async def run() -> None:
+        coordinator, delivered = make_coordinator(auth, grace=10)
+        task = asyncio.create_task(coordinator.run())
+        await wait_until(lambda: auth.connection_callback is not None)
+        assert auth.connection_callback is not None
+        assert auth.data_callback is not None
+        auth.connection_callback(True)
+        await auth.data_callback(auth.devices)
+        auth.connection_callback(False)
+
+        auth.gate.clear()
+        auth.devices["a"] = payload(RUNNING, 5)
+        auth.devices["b"] = payload(RUNNING, 7)
+        auth.connection_callback(True)
+        await wait_until(lambda: auth.fetched == ["a"])
+        # b arrives on the new stream while a is being fetched
+        await auth.data_callback({"b": auth.devices["b"]})
+        auth.gate.set()
+        await wait_until(lambda: {"a": payload(RUNNING, 5)} in delivered)
+        await asyncio.sleep(0.01)
+        assert auth.fetched == ["a"]
+        assert auth.polls == 0
+        task.cancel()
+
+    asyncio.run(run())
+
+
+def test_full_resync_after_long_gap() -> None:
+    """A gap longer than resync_full_after refetches all devices."""
+    auth = FakeAuth({"a": payload(OFF)})
+
+    async def run() -> None:
+        coordinator, _ = make_coordinator(auth, grace=10, resync_full_after=0)
+        task = asyncio.create_task(coordinator.run())
+        await wait_until(lambda: auth.connection_callback is not None)
+        assert auth.connection_callback is not None
+        auth.connection_callback(False)
+        auth.connection_callback(True)
+        await wait_until(lambda: auth.polls == 1)
+        assert auth.fetched == []
+        task.cancel()
+
+    asyncio.run(run())
+
+
+def test_stale_resync_cancelled() -> None:
+    """A second reconnect cancels a resync still running from the first."""
+    auth = FakeAuth({"a": payload(RUNNING)})
+
+    async def run() -> None:
+        coordinator, _ = make_coordinator(auth, grace=10)
+        await coordinator._deliver(dict(auth.devices))  # noqa: SLF001
+        auth.gate.clear()
+        coordinator._handle_connection(False)  # noqa: SLF001
+        coordinator._handle_connection(True)  # noqa: SLF001
+        first = coordinator._resync  # noqa: SLF001
+        await wait_until(lambda: auth.fetched == ["a"])
+        coordinator._handle_connection(False)  # noqa: SLF001
+        coordinator._handle_connection(True)  # noqa: SLF001
+        await asyncio.sleep(0)
+        assert first is not None
+        assert first.cancelled()
+        auth.gate.set()
+        await wait_until(lambda: coordinator._resync.done())  # type: ignore[union-attr]  # noqa: SLF001
+        coordinator._stop_polling()  # noqa: SLF001
+
+    asyncio.run(run())
+
+
+def test_resync_callback_error_logged(caplog: pytest.LogCaptureFixture) -> None:
+    """A failing callback during resync is logged, not left unretrieved."""
+    auth = FakeAuth({"a": payload(RUNNING)})
+
+    async def run() -> None:
+        coordinator, _ = make_coordinator(auth, grace=10)
+        await coordinator._deliver(dict(auth.devices))  # noqa: SLF001
+        auth.devices["a"] = payload(RUNNING, 3)
+
+        async def failing(data: dict[str, Any]) -> None:
+            raise RuntimeError("consumer bug")
+
+        coordinator.data_callback = failing
+        coordinator._handle_connection(False)  # noqa: SLF001
+        coordinator._handle_connection(True)  # noqa: SLF001
+        resync = coordinator._resync  # noqa: SLF001
+        assert resync is not None
+        await resync
+        coordinator._stop_polling()  # noqa: SLF001
+
+    asyncio.run(run())
+    assert "Error resyncing after event gap" in caplog.text
@@ -0,0 +1,333 @@
+"""Tests for the command journal."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import json
+from pathlib import Path
+import time
+from typing import Any
+
+from aiohttp import ClientResponseError, RequestInfo
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from pymiele import (
+    OUTCOME_EXPIRED,
+    OUTCOME_FAILED,
+    OUTCOME_SENT,
+    OUTCOME_SUPERSEDED,
+    MieleCommand,
+    MieleCommandJournal,
+    MieleJournalOutcome,
+)
+
+SERIAL = "000123456789"
+
+
+class FakeResponse:
+    """Response with only a status."""
+
+    def __init__(self, status: int) -> None:
+        """Initialize FakeResponse."""
+        self.status = status
+
+
+class FakeAuth:
+    """Auth that records target temperatures and answers with a handler."""
+
+    def __init__(
+        self, handler: Callable[[float], Awaitable[int]] | None = None
+    ) -> None:
+        """Initialize FakeAuth."""
+        self.handler = handler
+        self.sent: list[float] = []
+
+    async def set_target_temperature(
+        self, serial: str, temperature: float, zone: int = 1, capabilities: Any = None
+    ) -> FakeResponse:
+        """Record the temperature and return the handler status."""
+        self.sent.append(temperature)
+        status = 204 if self.handler is None else await self.handler(temperature)
+        return FakeResponse(status)
+
+    async def send_action(
+        self, serial: str, data: dict[str, Any], capabilities: Any = None
+    ) -> FakeResponse:
+        """Accept an action."""
+        return FakeResponse(204)
+
+
+def response_error(status: int) -> ClientResponseError:
+    """Return an API error with a status."""
+    url = URL("https://api.mcs3.miele.com/v1/devices")
+    info = RequestInfo(url, "PUT", CIMultiDictProxy(CIMultiDict()), url)
+    return ClientResponseError(info, (), status=status)
+
+
+def records(path: Path) -> list[dict[str, Any]]:
+    """Return the records in a journal file."""
+    return [json.loads(row) for row in path.read_text().splitlines()]
+
+
+async def wait_until(condition: Callable[[], bool]) -> None:
+    """Wait for a condition to become true."""
+    for _ in range(2000):
+        if condition():
+            return
+        await asyncio.sleep(0.001)
+    raise TimeoutError
+
+
+def make_journal(
+    auth: FakeAuth, path: Path, outcomes: list[MieleJournalOutcome], **kwargs: Any
+) -> MieleCommandJournal:
+    """Return a journal with fast retries collecting outcomes."""
+    kwargs.setdefault("retry_initial", 0.01)
+    kwargs.setdefault("retry_max", 0.01)
+    return MieleCommandJournal(auth, path, outcomes.append, **kwargs)  # type: ignore[arg-type]
+
+
+def test_rebuild_after_torn_line(tmp_path: Path) -> None:
+    """Pending commands are rebuilt and a torn last line is dropped."""
+    path = tmp_path / "journal"
+    add = {"op": "add", "serial": SERIAL, "kind": "target_temperature"}
+    rows = [
+        {**add, "id": "a", "data": {"temperature": 20, "zone": 1}, "created": 1.0},
+        {**add, "id": "b", "data": {"temperature": 21, "zone": 2}, "created": 2.0},
+        {"op": "end", "id": "a", "outcome": OUTCOME_SENT},
+    ]
+    path.write_text(
+        "".join(json.dumps(row) + "\n" for row in rows) + '{"op": "add", "id": "c'
+    )
+
+    journal = make_journal(FakeAuth(), path, [])
+
+    assert list(journal.pending) == ["b"]
+    assert journal.pending["b"].command.data == {"temperature": 21, "zone": 2}
+    assert [row["id"] for row in records(path)] == ["b"]
+
+
+def test_supersede_pending(tmp_path: Path) -> None:
+    """A newer command for the same setting replaces a queued one."""
+    path = tmp_path / "journal"
+    outcomes: list[MieleJournalOutcome] = []
+    auth = FakeAuth()
+
+    async def run() -> None:
+        journal = make_journal(auth, path, outcomes)
+        first = await journal.submit(SERIAL, MieleCommand.target_temperature(20))
+        second = await journal.submit(SERIAL, MieleCommand.target_temperature(22))
+        other = await journal.submit(SERIAL, MieleCommand.target_temperature(5, 2))
+        assert list(journal.pending) == [second, other]
+        assert [(o.entry_id, o.outcome) for o in outcomes] == [
+            (first, OUTCOME_SUPERSEDED)
+        ]
+        assert list(make_journal(auth, path, []).pending) == [second, other]
+
+    asyncio.run(run())
+
+
+def test_supersede_actions(tmp_path: Path) -> None:
+    """Only actions changing the same setting replace each other."""
+    outcomes: list[MieleJournalOutcome] = []
+
+    async def run() -> None:
+        journal = make_journal(FakeAuth(), tmp_path / "journal", outcomes)
+        freeze = await journal.submit(SERIAL, MieleCommand.action({"processAction": 4}))
+        cool = await journal.submit(SERIAL, MieleCommand.action({"processAction": 6}))
+        await journal.submit(SERIAL, MieleCommand.action({"processAction": 1}))
+        await journal.submit(SERIAL, MieleCommand.action({"processAction": 3}))
+        assert outcomes == []
+        await journal.submit(SERIAL, MieleCommand.action({"processAction": 5}))
+        await journal.submit(SERIAL, MieleCommand.action({"processAction": 7}))
+        light = await journal.submit(SERIAL, MieleCommand.action({"light": 1}))
+        await journal.submit(SERIAL, MieleCommand.action({"light": 2}))
+        assert [o.entry_id for o in outcomes] == [freeze, cool, light]
+        assert {o.outcome for o in outcomes} == {OUTCOME_SUPERSEDED}
+
+    asyncio.run(run())
+
+
+def test_supersede_in_flight_after_failure(tmp_path: Path) -> None:
+    """An in-flight command that fails is not retried once superseded."""
+    path = tmp_path / "journal"
+    outcomes: list[MieleJournalOutcome] = []
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def handler(temperature: float) -> int:
+        if temperature == 20:
+            started.set()
+            await release.wait()
+            raise TimeoutError
+        return 204
+
+    auth = FakeAuth(handler)
+
+    async def run() -> None:
+        journal = make_journal(auth, path, outcomes)
+        task = asyncio.create_task(journal.run())
+        first = await journal.submit(SERIAL, MieleCommand.target_temperature(20))
+        await started.wait()
+        second = await journal.submit(SERIAL, MieleCommand.target_temperature(22))
+        # The in-flight command is left alone while it is being sent
+        assert list(journal.pending) == [first, second]
+        release.set()
+        await wait_until(lambda: len(outcomes) == 2)
+        task.cancel()
+        assert auth.sent == [20, 22]
+        assert [(o.entry_id, o.outcome) for o in outcomes] == [
+            (first, OUTCOME_SUPERSEDED),
+            (second, OUTCOME_SENT),
+        ]
+
+    asyncio.run(run())
+
+
+def test_expired(tmp_path: Path) -> None:
+    """Commands older than max_age are dropped without sending."""
+    outcomes: list[MieleJournalOutcome] = []
+    auth = FakeAuth()
+
+    async def run() -> None:
+        journal = make_journal(auth, tmp_path / "journal", outcomes, max_age=60)
+        entry_id = await journal.submit(SERIAL, MieleCommand.target_temperature(20))
+        journal.pending[entry_id].created = time.time() - 61
+        task = asyncio.create_task(journal.run())
+        await wait_until(lambda: bool(outcomes))
+        task.cancel()
+
+    asyncio.run(run())
+    assert auth.sent == []
+    assert [o.outcome for o in outcomes] == [OUTCOME_EXPIRED]
+
+
+def test_client_error_is_final(tmp_path: Path) -> None:
+    """A 4xx response ends the command without retrying."""
+    outcomes: list[MieleJournalOutcome] = []
+
+    async def handler(temperature: float) -> int:
+        raise response_error(400)
+
+    auth = FakeAuth(handler)
+
+    async def run() -> None:
+        journal = make_journal(auth, tmp_path / "journal", outcomes)
+        task = asyncio.create_task(journal.run())
+        await journal.submit(SERIAL, MieleCommand.target_temperature(20))
+        await wait_until(lambda: bool(outcomes))
+        task.cancel()
+
+    asyncio.run(run())
+    assert auth.sent == [20]
+    assert [(o.outcome, o.status) for o in outcomes] == [(OUTCOME_FAILED, 400)]
+
+
+def test_server_error_backs_off(tmp_path: Path) -> None:
+    """A 5xx response is retried until the command is accepted."""
+    outcomes: list[MieleJournalOutcome] = []
+    failures = [503, 429]
+
+    async def handler(temperature: float) -> int:
+        if failures:
+            raise response_error(failures.pop(0))
+        return 204
+
+    auth = FakeAuth(handler)
+
+    async def run() -> None:
+        journal = make_journal(auth, tmp_path / "journal", outcomes)
+        task = asyncio.create_task(journal.run())
+        await journal.submit(SERIAL, MieleCommand.target_temperature(20))
+        await wait_until(lambda: bool(outcomes))
+        task.cancel()
+
+    asyncio.run(run())
+    assert auth.sent == [20, 20, 20]
+    assert [(o.outcome, o.status) for o in outcomes] == [(OUTCOME_SENT, 204)]
+
+
+def test_unexpected_error_keeps_running(tmp_path: Path) -> None:
+    """An unexpected exception fails one command and the queue continues."""
+    outcomes: list[MieleJournalOutcome] = []
+
+    async def handler(temperature: float) -> int:
+        if temperature == 20:
+            raise KeyError("boom")
+        return 204
+
+    auth = FakeAuth(handler)
+
+    async def run() -> None:
+        journal = make_journal(auth, tmp_path / "journal", outcomes)
+        task = asyncio.create_task(journal.run())
+        await journal.submit(SERIAL, MieleCommand.target_temperature(20))
+        await journal.submit(SERIAL, MieleCommand.target_temperature(5, 2))
+        await wait_until(lambda: len(outcomes) == 2)
+        assert not task.done()
+        task.cancel()
+
+    asyncio.run(run())
+    assert [o.outcome for o in outcomes] == [OUTCOME_FAILED, OUTCOME_SENT]
+
+
+def test_truncated_when_empty(tmp_path: Path) -> None:
+    """The file is emptied once nothing is pending, and kept until then."""
+    path = tmp_path / "journal"
+    outcomes: list[MieleJournalOutcome] = []
+    release = asyncio.Event()
+
+    async def handler(temperature: float) -> int:
+        if temperature == 5:
+            await release.wait()
+        return 204
+
+    async def run() -> None:
+        journal = make_journal(FakeAuth(handler), path, outcomes)
+        await journal.submit(SERIAL, MieleCommand.target_temperature(20))
+        await journal.submit(SERIAL, MieleCommand.target_temperature(5, 2))
+        task = asyncio.create_task(journal.run())
+        await wait_until(lambda: len(outcomes) == 1)
+        assert [row["op"] for row in records(path)] == ["add", "add", "end"]
+        release.set()
+        await wait_until(lambda: len(outcomes) == 2)
+        task.cancel()
+
+    asyncio.run(run())
+    assert path.read_text() == ""
+
+
+def test_submit_during_finish_is_kept(tmp_path: Path) -> None:
+    """A command submitted while the last one finishes survives truncation."""
+    path = tmp_path / "journal"
+    outcomes: list[MieleJournalOutcome] = []
+    hang = asyncio.Event()
+
+    async def handler(temperature: float) -> int:
+        if temperature == 20:
+            await asyncio.sleep(0.02)
+            return 204
+        await hang.wait()
+        return 204
+
+    async def run() -> None:
+        journal = make_journal(FakeAuth(handler), path, outcomes)
+        await journal.submit(SERIAL, MieleCommand.target_temperature(20))
+        write_file = journal._write_file  # noqa: SLF001
+
+        def slow_write(data: str, mode: str) -> None:
+            time.sleep(0.1)
+            write_file(data, mode)
+
+        journal._write_file = slow_write  # type: ignore[method-assign]  # noqa: SLF001
+        task = asyncio.create_task(journal.run())
+        await asyncio.sleep(0)
+        second = await journal.submit(SERIAL, MieleCommand.target_temperature(5, 2))
+        await wait_until(lambda: bool(outcomes))
+        assert list(journal.pending) == [second]
+        assert second in {row["id"] for row in records(path)}
+        task.cancel()
+
+    asyncio.run(run())
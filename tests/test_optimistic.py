@@ -0,0 +1,156 @@
+"""Tests for optimistic local updates."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from aiohttp import ClientError
+import pytest
+
+from pymiele import MieleAction, MieleDevice, MieleOptimisticUpdater
+
+SERIAL = "000123456789"
+
+
+def device_payload(light: int = 2, target: int = 400, remaining: int = 10) -> dict:
+    """Return a fridge payload."""
+    return {
+        "state": {
+            "light": light,
+            "remainingTime": [0, remaining],
+            "targetTemperature": [
+                {"value_raw": target, "value_localized": target / 100, "unit": "C"}
+            ],
+        }
+    }
+
+
+class FakeAuth:
+    """Auth that accepts commands or fails them with an error."""
+
+    def __init__(self, error: BaseException | None = None) -> None:
+        """Initialize FakeAuth."""
+        self.error = error
+
+    async def _answer(self) -> int:
+        if self.error is not None:
+            raise self.error
+        return 204
+
+    async def send_action(self, serial: str, data: dict[str, Any]) -> int:
+        """Answer an action."""
+        return await self._answer()
+
+    async def set_target_temperature(
+        self, serial: str, temperature: float, zone: int = 1
+    ) -> int:
+        """Answer a target temperature."""
+        return await self._answer()
+
+
+def make_updater(
+    auth: FakeAuth, **kwargs: Any
+) -> tuple[MieleOptimisticUpdater, list[dict[str, Any]]]:
+    """Return an updater for one device collecting delivered events."""
+    delivered: list[dict[str, Any]] = []
+
+    async def on_devices(data: dict[str, Any]) -> None:
+        delivered.append(data)
+
+    updater = MieleOptimisticUpdater(
+        auth,  # type: ignore[arg-type]
+        {SERIAL: MieleDevice(device_payload())},
+        {SERIAL: MieleAction({"powerOn": True, "powerOff": False})},
+        data_callback=on_devices,
+        **kwargs,
+    )
+    return updater, delivered
+
+
+def test_patch_kept_until_confirmed() -> None:
+    """Unrelated events keep showing the patch until an event reports it."""
+
+    async def run() -> None:
+        updater, delivered = make_updater(FakeAuth())
+        device = updater.devices[SERIAL]
+        original = device.raw_data
+
+        await updater.send_action(SERIAL, {"light": 1})
+        await updater.set_target_temperature(SERIAL, 6)
+        assert device.state_light == 1
+        assert device.state_target_temperature[0].temperature == 600
+        # Patches copy on write, the reported payload is left alone
+        assert original["state"]["light"] == 2
+
+        await updater.async_handle_devices({SERIAL: device_payload(remaining=9)})
+        assert device.state_light == 1
+        assert device.state_remaining_time == [0, 9]
+        assert delivered[-1][SERIAL]["state"]["light"] == 1
+        await updater.async_handle_actions({SERIAL: {"powerOn": True}})
+        assert updater.is_pending(SERIAL)
+
+        await updater.async_handle_devices({SERIAL: device_payload(light=1)})
+        assert device.state_light == 1
+        assert device.state_target_temperature[0].temperature == 600
+        assert updater.is_pending(SERIAL)
+
+        await updater.async_handle_devices(
+            {SERIAL: device_payload(light=1, target=600, remaining=8)}
+        )
+        assert not updater.is_pending(SERIAL)
+        assert device.state_remaining_time == [0, 8]
+
+    asyncio.run(run())
+
+
+def test_action_patch() -> None:
+    """Power actions patch the actions until confirmed."""
+
+    async def run() -> None:
+        updater, _ = make_updater(FakeAuth())
+        action = updater.actions[SERIAL]
+
+        await updater.send_action(SERIAL, {"powerOn": True})
+        assert (action.power_on_enabled, action.power_off_enabled) == (False, True)
+        await updater.async_handle_devices({SERIAL: device_payload()})
+        assert (action.power_on_enabled, action.power_off_enabled) == (False, True)
+        await updater.async_handle_actions(
+            {SERIAL: {"powerOn": False, "powerOff": True}}
+        )
+        assert not updater.is_pending(SERIAL)
+
+    asyncio.run(run())
+
+
+def test_rollback_on_error() -> None:
+    """A failed command restores the reported values."""
+
+    async def run() -> None:
+        updater, _ = make_updater(FakeAuth(ClientError()))
+        device = updater.devices[SERIAL]
+
+        with pytest.raises(ClientError):
+            await updater.send_action(SERIAL, {"light": 1})
+        assert device.state_light == 2
+        assert not updater.is_pending(SERIAL)
+
+    asyncio.run(run())
+
+
+def test_rollback_on_timeout() -> None:
+    """Without a confirming event the latest reported values come back."""
+
+    async def run() -> None:
+        updater, _ = make_updater(FakeAuth(), rollback_after=0.05)
+        device = updater.devices[SERIAL]
+
+        await updater.send_action(SERIAL, {"light": 1})
+        await updater.async_handle_devices({SERIAL: device_payload(remaining=9)})
+        assert device.state_light == 1
+        await asyncio.sleep(0.1)
+        assert not updater.is_pending(SERIAL)
+        assert device.state_light == 2
+        assert device.state_remaining_time == [0, 9]
+
+    asyncio.run(run())
@@ -0,0 +1,91 @@
+"""Tests for incremental JSON object decoding."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+import json
+from typing import Any
+
+import pytest
+
+from pymiele import JSONObjectStreamParser, iter_json_object
+
+TRICKY = {
+    "000111": {"name": 'Wash "quick" }, {', "path": "C:\\temp\\", "n": [1, {}]},
+    "000222": {"name": "Kühlschrank € ❄", "empty": [], "none": None},
+    'key "with" \\ escapes,}': -1.5e3,
+    "000333": True,
+}
+
+
+async def chunked(data: bytes, size: int) -> AsyncIterator[bytes]:
+    """Yield data in chunks of a fixed size."""
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+def collect(data: bytes, size: int) -> list[tuple[str, Any]]:
+    """Decode data split into chunks of size."""
+
+    async def run() -> list[tuple[str, Any]]:
+        return [member async for member in iter_json_object(chunked(data, size))]
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 4096])
+def test_round_trip(size: int) -> None:
+    """Members come out in order regardless of where chunks are split."""
+    data = json.dumps(TRICKY, ensure_ascii=False, indent=1).encode()
+
+    assert collect(data, size) == list(TRICKY.items())
+
+
+def test_multibyte_split() -> None:
+    """A UTF-8 character split over chunks is decoded once complete."""
+    data = json.dumps({"a": "❄"}, ensure_ascii=False).encode()
+    split = data.index("❄".encode()) + 1
+
+    async def chunks() -> AsyncIterator[bytes]:
+        yield data[:split]
+        yield data[split:]
+
+    async def run() -> list[tuple[str, Any]]:
+        return [member async for member in iter_json_object(chunks())]
+
+    assert asyncio.run(run()) == [("a", "❄")]
+
+
+def test_empty_object() -> None:
+    """An empty object yields nothing and completes."""
+    parser = JSONObjectStreamParser()
+
+    assert parser.feed(" {") == []
+    assert parser.feed(" } ") == []
+    assert parser.done
+    assert collect(b"{}", 1) == []
+
+
+def test_members_as_they_complete() -> None:
+    """Each member is returned as soon as its value is complete."""
+    parser = JSONObjectStreamParser()
+
+    assert parser.feed('{"a": {"b": "}"') == []
+    assert parser.feed('}, "c"') == [("a", {"b": "}"})]
+    assert parser.feed(": 2}") == [("c", 2)]
+
+
+@pytest.mark.parametrize(
+    "data", [b"", b"{", b'{"a": 1', b'{"a": {"b": 1}', b'{"a": "x}']
+)
+def test_truncated(data: bytes) -> None:
+    """A body that ends early raises ValueError."""
+    with pytest.raises(ValueError):
+        collect(data, 2)
+
+
+def test_not_an_object() -> None:
+    """Anything but an object is rejected."""
+    with pytest.raises(ValueError):
+        collect(b"[1, 2]", 10)
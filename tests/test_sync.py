@@ -0,0 +1,51 @@
+"""Tests for the blocking client."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from typing import Any
+
+from aiohttp import ClientSession
+
+from pymiele import MieleDevice, MieleSyncClient
+
+
+class FakeAuth:
+    """Auth answering device requests from a fixed payload."""
+
+    def __init__(self, websession: ClientSession) -> None:
+        """Initialize FakeAuth."""
+        self.websession = websession
+        self.event_websession: ClientSession | None = None
+        self.closed = False
+        self.devices = {"000111": {"ident": {}}, "000222": {"ident": {}}}
+
+    async def get_device(self, serial: str) -> dict[str, Any]:
+        """Return one device."""
+        return self.devices[serial]
+
+    async def iter_devices(self) -> AsyncIterator[tuple[str, MieleDevice]]:
+        """Yield all devices."""
+        try:
+            for serial, payload in self.devices.items():
+                yield serial, MieleDevice(payload)
+        finally:
+            self.closed = True
+
+
+def test_iter_devices() -> None:
+    """Devices are yielded one by one and the generator is closed early."""
+    with MieleSyncClient(FakeAuth) as client:  # type: ignore[arg-type]
+        assert [serial for serial, _ in client.iter_devices()] == ["000111", "000222"]
+        devices = client.iter_devices()
+        serial, device = next(devices)
+        assert serial == "000111"
+        assert isinstance(device, MieleDevice)
+        devices.close()
+        assert client.auth.closed  # type: ignore[attr-defined]
+
+
+def test_get_device() -> None:
+    """A single device is fetched through the loop thread."""
+    with MieleSyncClient(FakeAuth) as client:  # type: ignore[arg-type]
+        assert client.get_device("000222") == {"ident": {}}